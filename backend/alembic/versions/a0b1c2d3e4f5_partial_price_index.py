@@ -0,0 +1,43 @@
+"""make the fact_market_data covering price index partial
+
+Revision ID: a0b1c2d3e4f5
+Revises: f9a0b1c2d3e4
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a0b1c2d3e4f5"
+down_revision: Union[str, None] = "f9a0b1c2d3e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every price read filters price_usd IS NOT NULL; plain (coin_id, timestamp)
+    # lookups are still served by the uq_market_coin_ts unique index
+    op.create_index(
+        "idx_fact_market_price_nonnull",
+        "fact_market_data",
+        ["coin_id", "timestamp"],
+        postgresql_include=["price_usd"],
+        postgresql_where=sa.text("price_usd IS NOT NULL"),
+    )
+    op.drop_index("idx_fact_market_coin_ts_price", table_name="fact_market_data")
+    # Refresh planner statistics so the partial index is picked up immediately
+    op.execute("ANALYZE fact_market_data")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "idx_fact_market_coin_ts_price",
+        "fact_market_data",
+        ["coin_id", "timestamp"],
+        postgresql_include=["price_usd"],
+    )
+    op.drop_index("idx_fact_market_price_nonnull", table_name="fact_market_data")
@@ -0,0 +1,26 @@
+"""add (created_at, id) index on pipeline_runs
+
+Revision ID: b1c2d3e4f5a6
+Revises: a0b1c2d3e4f5
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b1c2d3e4f5a6"
+down_revision: Union[str, None] = "a0b1c2d3e4f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves newest-first listing and (created_at, id) keyset pagination of runs
+    op.create_index("idx_pipeline_runs_created", "pipeline_runs", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_pipeline_runs_created", table_name="pipeline_runs")
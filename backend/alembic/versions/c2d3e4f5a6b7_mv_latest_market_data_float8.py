@@ -0,0 +1,46 @@
+"""expose mv_latest_market_data market values as double precision
+
+Revision ID: c2d3e4f5a6b7
+Revises: b1c2d3e4f5a6
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2d3e4f5a6b7"
+down_revision: Union[str, None] = "b1c2d3e4f5a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_view(value_type: str) -> None:
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW mv_latest_market_data AS
+        SELECT DISTINCT ON (coin_id)
+            coin_id, timestamp,
+            price_usd::{value_type} AS price_usd,
+            market_cap::{value_type} AS market_cap,
+            total_volume::{value_type} AS total_volume,
+            price_change_24h_pct::{value_type} AS price_change_24h_pct,
+            circulating_supply::{value_type} AS circulating_supply
+        FROM fact_market_data
+        ORDER BY coin_id, timestamp DESC
+    """)
+    # Required by REFRESH MATERIALIZED VIEW CONCURRENTLY in the ingestion jobs
+    op.execute("CREATE UNIQUE INDEX idx_mv_latest_coin ON mv_latest_market_data (coin_id)")
+
+
+def upgrade() -> None:
+    # The view is read on every market/portfolio request; float8 columns come
+    # back from the driver as Python floats instead of Decimal
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_latest_market_data")
+    _create_view("double precision")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_latest_market_data")
+    _create_view("numeric")
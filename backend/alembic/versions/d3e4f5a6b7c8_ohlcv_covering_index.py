@@ -0,0 +1,33 @@
+"""add a covering (coin_id, date) index to fact_daily_ohlcv
+
+Revision ID: d3e4f5a6b7c8
+Revises: c2d3e4f5a6b7
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3e4f5a6b7c8"
+down_revision: Union[str, None] = "c2d3e4f5a6b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The candle endpoint reads every price column for one coin over a date
+    # range; including them turns the heap fetches into an index-only scan
+    op.create_index(
+        "idx_ohlcv_coin_date_covering",
+        "fact_daily_ohlcv",
+        ["coin_id", "date"],
+        postgresql_include=["open_price", "high_price", "low_price", "close_price", "volume"],
+    )
+    op.execute("ANALYZE fact_daily_ohlcv")
+
+
+def downgrade() -> None:
+    op.drop_index("idx_ohlcv_coin_date_covering", table_name="fact_daily_ohlcv")
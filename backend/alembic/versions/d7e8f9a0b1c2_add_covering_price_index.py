@@ -0,0 +1,34 @@
+"""add covering price index on fact_market_data
+
+Revision ID: d7e8f9a0b1c2
+Revises: c4e5f6a7b8d9
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d7e8f9a0b1c2"
+down_revision: Union[str, None] = "c4e5f6a7b8d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (coin_id, timestamp) INCLUDE (price_usd) lets sparkline/history reads run as
+    # index-only scans; it supersedes the plain (coin_id, timestamp) index
+    op.create_index(
+        "idx_fact_market_coin_ts_price",
+        "fact_market_data",
+        ["coin_id", "timestamp"],
+        postgresql_include=["price_usd"],
+    )
+    op.drop_index("idx_fact_market_coin_ts", table_name="fact_market_data")
+
+
+def downgrade() -> None:
+    op.create_index("idx_fact_market_coin_ts", "fact_market_data", ["coin_id", "timestamp"], unique=False)
+    op.drop_index("idx_fact_market_coin_ts_price", table_name="fact_market_data")
@@ -0,0 +1,42 @@
+"""add trigram indexes for coin name/symbol search
+
+Revision ID: e8f9a0b1c2d3
+Revises: d7e8f9a0b1c2
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8f9a0b1c2d3"
+down_revision: Union[str, None] = "d7e8f9a0b1c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # GIN trigram indexes serve the two-sided ILIKE '%term%' search in /coins,
+    # which a B-tree index cannot
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "idx_dim_coin_name_trgm",
+        "dim_coin",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "idx_dim_coin_symbol_trgm",
+        "dim_coin",
+        ["symbol"],
+        postgresql_using="gin",
+        postgresql_ops={"symbol": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_dim_coin_symbol_trgm", table_name="dim_coin")
+    op.drop_index("idx_dim_coin_name_trgm", table_name="dim_coin")
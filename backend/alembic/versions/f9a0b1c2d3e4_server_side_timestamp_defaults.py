@@ -0,0 +1,45 @@
+"""server-side defaults for created/updated timestamps
+
+Revision ID: f9a0b1c2d3e4
+Revises: e8f9a0b1c2d3
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f9a0b1c2d3e4"
+down_revision: Union[str, None] = "e8f9a0b1c2d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs previously defaulted in Python
+_COLUMNS = [
+    ("dim_coin", "created_at"),
+    ("dim_coin", "updated_at"),
+    ("portfolio_holdings", "created_at"),
+    ("portfolio_holdings", "updated_at"),
+    ("data_quality_checks", "executed_at"),
+    ("analytics_correlation", "computed_at"),
+    ("analytics_volatility", "computed_at"),
+    ("user_watchlist", "created_at"),
+    ("price_alerts", "created_at"),
+    ("pipeline_runs", "created_at"),
+    ("users", "created_at"),
+]
+
+
+def upgrade() -> None:
+    # Columns are naive UTC `timestamp`, so convert now() explicitly rather than
+    # relying on the session TimeZone
+    for table, column in _COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("timezone('utc', now())"))
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.alter_column(table, column, server_default=None)
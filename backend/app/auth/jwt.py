@@ -1,21 +1,45 @@
+import time
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
-from jose import JWTError, jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 import bcrypt
+import jwt
+from jwt import InvalidTokenError
 
 from app.config import settings
 
+# argon2id for new hashes; legacy bcrypt hashes are still accepted on verify
+_password_hasher = PasswordHasher(
+    time_cost=settings.PASSWORD_HASH_TIME_COST,
+    memory_cost=settings.PASSWORD_HASH_MEMORY_COST,
+    parallelism=2,
+)
+_ARGON2_PREFIX = "$argon2"
+
 
 def hash_password(password: str) -> str:
-    pw_bytes = password.encode("utf-8")[:72]
-    return bcrypt.hashpw(pw_bytes, bcrypt.gensalt()).decode("utf-8")
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if hashed_password.startswith(_ARGON2_PREFIX):
+        try:
+            return _password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
     pw_bytes = plain_password.encode("utf-8")[:72]
     return bcrypt.checkpw(pw_bytes, hashed_password.encode("utf-8"))
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for legacy bcrypt hashes or argon2 hashes with outdated parameters."""
+    if not hashed_password.startswith(_ARGON2_PREFIX):
+        return True
+    return _password_hasher.check_needs_rehash(hashed_password)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     now = datetime.now(timezone.utc)
@@ -24,12 +48,24 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
-def decode_access_token(token: str) -> dict | None:
+@lru_cache(maxsize=4096)
+def _decode_verified(token: str, secret: str, algorithm: str) -> dict | None:
+    """Verify signature and decode claims once per token; expiry is checked by the caller."""
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-        return payload
-    except JWTError:
+        return jwt.decode(token, secret, algorithms=[algorithm], options={"verify_exp": False})
+    except InvalidTokenError:
+        return None
+
+
+def decode_access_token(token: str) -> dict | None:
+    payload = _decode_verified(token, settings.JWT_SECRET, settings.JWT_ALGORITHM)
+    if payload is None:
+        return None
+    # Cached entries outlive the token, so expiry must be re-checked on every call
+    exp = payload.get("exp")
+    if exp is not None and exp < time.time():
         return None
+    return dict(payload)
 
 
 def decode_access_token_for_refresh(token: str) -> dict | None:
@@ -56,5 +92,5 @@ def decode_access_token_for_refresh(token: str) -> dict | None:
                 if datetime.now(timezone.utc) - expired_at > timedelta(hours=24):
                     return None
         return payload
-    except JWTError:
+    except InvalidTokenError:
         return None
@@ -23,6 +23,9 @@ class Settings(BaseSettings):
     COINGECKO_RATE_LIMIT: int = 10  # requests per minute
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "https://cryptoflow.deka-labs.dev"]
     ENVIRONMENT: str = "development"
+    # argon2id cost for new password hashes; the test suite lowers these
+    PASSWORD_HASH_TIME_COST: int = 2
+    PASSWORD_HASH_MEMORY_COST: int = 64 * 1024  # KiB
 
     @model_validator(mode="after")
     def _warn_insecure_secret(self) -> "Settings":
@@ -1,18 +1,30 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.config import settings
 
+# psycopg 3 turns a statement into a server-side prepared statement once it has
+# run `prepare_threshold` times on a connection, so the hot /coins queries are
+# parsed and planned once per pooled connection instead of on every request.
+DATABASE_URL = make_url(settings.DATABASE_URL)
+if DATABASE_URL.drivername == "postgresql":
+    DATABASE_URL = DATABASE_URL.set(drivername="postgresql+psycopg")
+
 engine = create_engine(
-    settings.DATABASE_URL,
+    DATABASE_URL,
     pool_pre_ping=True,
     pool_size=20,
     max_overflow=40,
     pool_recycle=3600,
-    connect_args={"options": "-c statement_timeout=30000"},
+    connect_args={"options": "-c statement_timeout=30000", "prepare_threshold": 5},
 )
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+# Timestamp columns are naive UTC `timestamp`; let PostgreSQL fill them in
+# instead of building a datetime per row in Python
+UTC_NOW = text("timezone('utc', now())")
+
 
 class Base(DeclarativeBase):
     pass
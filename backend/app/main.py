@@ -1,13 +1,13 @@
 import asyncio
-import json
 import logging
 import time
 from contextlib import asynccontextmanager
 
+import orjson
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.gzip import GZipMiddleware
 
 from app.config import settings
@@ -25,7 +25,7 @@ async def _check_realtime_alerts(price_data: dict):
     try:
         from app.database import SessionLocal
         from app.models.alert import PriceAlert
-        from app.models.coin import DimCoin
+        from app.services.coin_cache import get_coin_infos
         from datetime import datetime, timezone
 
         db = SessionLocal()
@@ -53,15 +53,14 @@ async def _check_realtime_alerts(price_data: dict):
                 return
 
             # Build coin_id -> coingecko_id mapping for alerts
-            coin_ids = list({a.coin_id for a in alerts})
-            coins = {c.id: c for c in db.query(DimCoin).filter(DimCoin.id.in_(coin_ids)).all()}
+            coins = get_coin_infos(db, {a.coin_id for a in alerts})
 
             for alert in alerts:
                 coin = coins.get(alert.coin_id)
-                if not coin or coin.coingecko_id not in price_data:
+                if not coin or coin["coingecko_id"] not in price_data:
                     continue
                 try:
-                    current_price = float(price_data[coin.coingecko_id])
+                    current_price = float(price_data[coin["coingecko_id"]])
                 except (ValueError, TypeError):
                     continue
 
@@ -70,60 +69,133 @@ async def _check_realtime_alerts(price_data: dict):
                     or (alert.direction == "below" and current_price <= float(alert.target_price))
                 )
                 if should_trigger:
-                    alert.triggered = True
-                    alert.triggered_at = datetime.now(timezone.utc)
+                    # Every API worker runs its own subscriber; claim the alert
+                    # atomically so only one of them notifies the user
+                    claimed = (
+                        db.query(PriceAlert)
+                        .filter(PriceAlert.id == alert.id, PriceAlert.triggered == False)  # noqa: E712
+                        .update(
+                            {"triggered": True, "triggered_at": datetime.now(timezone.utc)},
+                            synchronize_session=False,
+                        )
+                    )
+                    db.commit()
+                    if not claimed:
+                        continue
                     await manager.send_to_user(alert.user_id, {
                         "type": "alert_triggered",
                         "data": {
                             "alert_id": alert.id,
                             "coin_id": alert.coin_id,
-                            "symbol": coin.symbol,
-                            "name": coin.name,
+                            "symbol": coin["symbol"],
+                            "name": coin["name"],
                             "direction": alert.direction,
                             "target_price": float(alert.target_price),
                             "current_price": current_price,
                         },
                     })
-            db.commit()
         finally:
             db.close()
     except Exception:
         logger.debug("Realtime alert check error", exc_info=True)
 
 
+# Shared across subscriber reconnects so a Redis blip doesn't rebuild the pool
+_redis_pool = None
+
+
+def _get_redis_pool(redis_url: str):
+    global _redis_pool
+    if _redis_pool is None:
+        import redis.asyncio as aioredis
+        # RESP3 delivers pubsub messages as push frames; keep payloads as bytes
+        # since orjson parses them directly
+        _redis_pool = aioredis.ConnectionPool.from_url(
+            redis_url, max_connections=4, protocol=3, decode_responses=False,
+        )
+    return _redis_pool
+
+
+# Upper bound on messages merged into a single broadcast
+_MAX_COALESCED_MESSAGES = 200
+
+
+def _coalesce_messages(payloads: list) -> list:
+    """Merge price_update payloads into one (latest price per coin wins).
+
+    Any other payloads are passed through unchanged, ahead of the merged update.
+    """
+    merged_prices: dict = {}
+    result = []
+    for data in payloads:
+        if isinstance(data, dict) and data.get("type") == "price_update" and isinstance(data.get("prices"), dict):
+            merged_prices.update(data["prices"])
+        else:
+            result.append(data)
+    if merged_prices:
+        result.append({"type": "price_update", "prices": merged_prices})
+    return result
+
+
+async def _close_pubsub(pubsub, channel: str):
+    """Release the pubsub connection back to the shared pool."""
+    if pubsub is None:
+        return
+    try:
+        await pubsub.unsubscribe(channel)
+        await pubsub.aclose()
+    except Exception:
+        pass
+
+
 async def _redis_subscriber(redis_url: str, channel: str):
     """Subscribe to Redis pub/sub and broadcast price updates to WebSocket clients."""
     import redis.asyncio as aioredis
 
+    pool = _get_redis_pool(redis_url)
     while True:
+        pubsub = None
         try:
-            r = aioredis.from_url(redis_url)
+            r = aioredis.Redis(connection_pool=pool)
             pubsub = r.pubsub()
             await pubsub.subscribe(channel)
             logger.info("Redis subscriber connected to channel %s", channel)
-            async for message in pubsub.listen():
-                if message["type"] != "message":
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+                if message is None:
                     continue
-                try:
-                    data = json.loads(message["data"])
-                    await manager.broadcast(data)
-                    # Check if any live prices trigger user alerts
-                    await _check_realtime_alerts(data)
-                except json.JSONDecodeError:
-                    logger.warning("Malformed JSON from Redis, skipping")
-                except Exception:
-                    logger.exception("Error broadcasting message")
+                batch = [message]
+                # Drain whatever is already buffered without waiting, so bursts
+                # go out as one frame while slow streams are still sent immediately
+                while len(batch) < _MAX_COALESCED_MESSAGES:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0)
+                    if message is None:
+                        break
+                    batch.append(message)
+
+                payloads = []
+                for message in batch:
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        payloads.append(orjson.loads(message["data"]))
+                    except orjson.JSONDecodeError:
+                        logger.warning("Malformed JSON from Redis, skipping")
+
+                for data in _coalesce_messages(payloads):
+                    try:
+                        await manager.broadcast(data)
+                        # Check if any live prices trigger user alerts
+                        await _check_realtime_alerts(data)
+                    except Exception:
+                        logger.exception("Error broadcasting message")
         except asyncio.CancelledError:
             logger.info("Redis subscriber shutting down")
-            try:
-                await pubsub.unsubscribe(channel)
-                await pubsub.aclose()
-                await r.aclose()
-            except Exception:
-                pass
+            await _close_pubsub(pubsub, channel)
             return
         except Exception:
             logger.exception("Redis subscriber error, reconnecting in 5s")
+            await _close_pubsub(pubsub, channel)
             await asyncio.sleep(5)
 
 
@@ -138,6 +210,8 @@ async def lifespan(app: FastAPI):
         await task
     except asyncio.CancelledError:
         pass
+    if _redis_pool is not None:
+        await _redis_pool.disconnect()
 
 
 app = FastAPI(
@@ -145,6 +219,7 @@ app = FastAPI(
     description="Real-Time Crypto Data Pipeline & Analytics Platform",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     redirect_slashes=False,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
@@ -180,7 +255,7 @@ async def origin_validation(request: Request, call_next):
         if origin:
             allowed = settings.CORS_ORIGINS
             if origin not in allowed:
-                return JSONResponse(
+                return ORJSONResponse(
                     status_code=403,
                     content={"detail": "Origin not allowed"},
                 )
@@ -220,12 +295,12 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
     from sqlalchemy.exc import OperationalError
     if isinstance(exc, OperationalError) and "statement timeout" in str(exc):
         logger.warning("Statement timeout on %s %s", request.method, request.url.path)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=504,
             content={"detail": "Query took too long. Try a shorter time range or fewer items."},
         )
     logger.exception("Unhandled exception on %s %s", request.method, request.url.path)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"},
     )
@@ -239,7 +314,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     for err in exc.errors():
         clean = {k: v for k, v in err.items() if k != "ctx"}
         errors.append(clean)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={"detail": errors},
     )
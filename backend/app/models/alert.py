@@ -1,10 +1,10 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from decimal import Decimal
 
 from sqlalchemy import ForeignKey, Index, Numeric
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, UTC_NOW
 
 
 class PriceAlert(Base):
@@ -19,7 +19,7 @@ class PriceAlert(Base):
     target_price: Mapped[Decimal] = mapped_column(Numeric(20, 8))
     direction: Mapped[str] = mapped_column()  # "above" or "below"
     triggered: Mapped[bool] = mapped_column(default=False)
-    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(server_default=UTC_NOW)
     triggered_at: Mapped[datetime | None] = mapped_column(default=None)
     webhook_status: Mapped[str | None] = mapped_column(default=None)  # "pending", "sent", "failed"
     webhook_attempts: Mapped[int] = mapped_column(default=0)
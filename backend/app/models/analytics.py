@@ -1,9 +1,9 @@
-from datetime import datetime, timezone
+from datetime import datetime
 
 from sqlalchemy import Integer, Numeric, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, UTC_NOW
 
 
 class AnalyticsCorrelation(Base):
@@ -16,8 +16,8 @@ class AnalyticsCorrelation(Base):
     coin_a_id: Mapped[int] = mapped_column(Integer, ForeignKey("dim_coin.id"), primary_key=True)
     coin_b_id: Mapped[int] = mapped_column(Integer, ForeignKey("dim_coin.id"), primary_key=True)
     period_days: Mapped[int] = mapped_column(Integer, primary_key=True)
-    correlation: Mapped[float | None] = mapped_column(Numeric(8, 6))
-    computed_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    correlation: Mapped[float | None] = mapped_column(Numeric(8, 6, asdecimal=False))
+    computed_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
 
 
 class AnalyticsVolatility(Base):
@@ -25,7 +25,7 @@ class AnalyticsVolatility(Base):
 
     coin_id: Mapped[int] = mapped_column(Integer, ForeignKey("dim_coin.id"), primary_key=True)
     period_days: Mapped[int] = mapped_column(Integer, primary_key=True)
-    volatility: Mapped[float | None] = mapped_column(Numeric(12, 6))
-    max_drawdown: Mapped[float | None] = mapped_column(Numeric(10, 4))
-    sharpe_ratio: Mapped[float | None] = mapped_column(Numeric(10, 4))
-    computed_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    volatility: Mapped[float | None] = mapped_column(Numeric(12, 6, asdecimal=False))
+    max_drawdown: Mapped[float | None] = mapped_column(Numeric(10, 4, asdecimal=False))
+    sharpe_ratio: Mapped[float | None] = mapped_column(Numeric(10, 4, asdecimal=False))
+    computed_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
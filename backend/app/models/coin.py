@@ -1,13 +1,18 @@
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import Integer, String, Text, DateTime, Numeric
+from sqlalchemy import Integer, String, Text, DateTime, Numeric, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, UTC_NOW
 
 
 class DimCoin(Base):
     __tablename__ = "dim_coin"
+    __table_args__ = (
+        # Trigram GIN indexes back the ILIKE '%term%' name/symbol search
+        Index("idx_dim_coin_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("idx_dim_coin_symbol_trgm", "symbol", postgresql_using="gin", postgresql_ops={"symbol": "gin_trgm_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     coingecko_id: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
@@ -17,13 +22,13 @@ class DimCoin(Base):
     description: Mapped[str | None] = mapped_column(Text)
     image_url: Mapped[str | None] = mapped_column(String(500))
     market_cap_rank: Mapped[int | None] = mapped_column(Integer)
-    ath: Mapped[float | None] = mapped_column(Numeric)
+    ath: Mapped[float | None] = mapped_column(Numeric(asdecimal=False))
     ath_date: Mapped[datetime | None] = mapped_column(DateTime)
-    atl: Mapped[float | None] = mapped_column(Numeric)
+    atl: Mapped[float | None] = mapped_column(Numeric(asdecimal=False))
     atl_date: Mapped[datetime | None] = mapped_column(DateTime)
-    total_supply: Mapped[float | None] = mapped_column(Numeric)
-    max_supply: Mapped[float | None] = mapped_column(Numeric)
-    high_24h: Mapped[float | None] = mapped_column(Numeric)
-    low_24h: Mapped[float | None] = mapped_column(Numeric)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    total_supply: Mapped[float | None] = mapped_column(Numeric(asdecimal=False))
+    max_supply: Mapped[float | None] = mapped_column(Numeric(asdecimal=False))
+    high_24h: Mapped[float | None] = mapped_column(Numeric(asdecimal=False))
+    low_24h: Mapped[float | None] = mapped_column(Numeric(asdecimal=False))
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW, onupdate=func.timezone("utc", func.now()))
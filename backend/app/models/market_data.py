@@ -1,6 +1,6 @@
 from datetime import datetime, date
 
-from sqlalchemy import Integer, BigInteger, Numeric, DateTime, Date, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import Integer, BigInteger, Numeric, DateTime, Date, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -12,16 +12,24 @@ class FactMarketData(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     coin_id: Mapped[int] = mapped_column(Integer, ForeignKey("dim_coin.id"), nullable=False)
     timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    price_usd: Mapped[float | None] = mapped_column(Numeric(20, 8))
-    market_cap: Mapped[float | None] = mapped_column(Numeric(24, 2))
-    total_volume: Mapped[float | None] = mapped_column(Numeric(24, 2))
-    price_change_24h_pct: Mapped[float | None] = mapped_column(Numeric(10, 4))
-    circulating_supply: Mapped[float | None] = mapped_column(Numeric(24, 2))
+    price_usd: Mapped[float | None] = mapped_column(Numeric(20, 8, asdecimal=False))
+    market_cap: Mapped[float | None] = mapped_column(Numeric(24, 2, asdecimal=False))
+    total_volume: Mapped[float | None] = mapped_column(Numeric(24, 2, asdecimal=False))
+    price_change_24h_pct: Mapped[float | None] = mapped_column(Numeric(10, 4, asdecimal=False))
+    circulating_supply: Mapped[float | None] = mapped_column(Numeric(24, 2, asdecimal=False))
 
     __table_args__ = (
         UniqueConstraint("coin_id", "timestamp", name="uq_market_coin_ts"),
         Index("idx_fact_market_ts", "timestamp", postgresql_using="btree"),
-        Index("idx_fact_market_coin_ts", "coin_id", "timestamp"),
+        # Partial covering index: per-coin time-range reads of non-null prices
+        # (sparklines, history, benchmarks) are index-only scans
+        Index(
+            "idx_fact_market_price_nonnull",
+            "coin_id",
+            "timestamp",
+            postgresql_include=["price_usd"],
+            postgresql_where=text("price_usd IS NOT NULL"),
+        ),
     )
 
 
@@ -31,12 +39,19 @@ class FactDailyOHLCV(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     coin_id: Mapped[int] = mapped_column(Integer, ForeignKey("dim_coin.id"), nullable=False)
     date: Mapped[date] = mapped_column(Date, ForeignKey("dim_time.date"), nullable=False)
-    open_price: Mapped[float | None] = mapped_column(Numeric(20, 8))
-    high_price: Mapped[float | None] = mapped_column(Numeric(20, 8))
-    low_price: Mapped[float | None] = mapped_column(Numeric(20, 8))
-    close_price: Mapped[float | None] = mapped_column(Numeric(20, 8))
-    volume: Mapped[float | None] = mapped_column(Numeric(24, 2))
+    open_price: Mapped[float | None] = mapped_column(Numeric(20, 8, asdecimal=False))
+    high_price: Mapped[float | None] = mapped_column(Numeric(20, 8, asdecimal=False))
+    low_price: Mapped[float | None] = mapped_column(Numeric(20, 8, asdecimal=False))
+    close_price: Mapped[float | None] = mapped_column(Numeric(20, 8, asdecimal=False))
+    volume: Mapped[float | None] = mapped_column(Numeric(24, 2, asdecimal=False))
 
     __table_args__ = (
         UniqueConstraint("coin_id", "date", name="uq_ohlcv_coin_date"),
+        # Covering index so per-coin candle ranges are index-only scans
+        Index(
+            "idx_ohlcv_coin_date_covering",
+            "coin_id",
+            "date",
+            postgresql_include=["open_price", "high_price", "low_price", "close_price", "volume"],
+        ),
     )
@@ -1,13 +1,17 @@
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import Integer, String, DateTime, Text
+from sqlalchemy import Integer, String, DateTime, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, UTC_NOW
 
 
 class PipelineRun(Base):
     __tablename__ = "pipeline_runs"
+    __table_args__ = (
+        # Newest-first listing and keyset pagination on (created_at, id)
+        Index("idx_pipeline_runs_created", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     dag_id: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -16,4 +20,4 @@ class PipelineRun(Base):
     end_time: Mapped[datetime | None] = mapped_column(DateTime)
     records_processed: Mapped[int] = mapped_column(Integer, default=0)
     error_message: Mapped[str | None] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
@@ -1,9 +1,10 @@
-from datetime import datetime, timezone
+from datetime import datetime
 
-from sqlalchemy import Integer, Numeric, Text, DateTime, ForeignKey, Index
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, Numeric, Text, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.database import Base
+from app.database import Base, UTC_NOW
+from app.models.coin import DimCoin
 
 
 class PortfolioHolding(Base):
@@ -15,8 +16,14 @@ class PortfolioHolding(Base):
     quantity: Mapped[float] = mapped_column(Numeric(24, 8), nullable=False)
     buy_price_usd: Mapped[float] = mapped_column(Numeric(20, 8), nullable=False)
     notes: Mapped[str | None] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW, onupdate=func.timezone("utc", func.now()))
+
+    coin: Mapped[DimCoin] = relationship()
+
+    # Return server-generated created_at/updated_at on INSERT and UPDATE so
+    # handlers can respond from the flushed object without a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     __table_args__ = (
         Index("idx_portfolio_user", "user_id"),
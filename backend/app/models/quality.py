@@ -1,9 +1,9 @@
-from datetime import datetime, timezone
+from datetime import datetime
 
 from sqlalchemy import Integer, String, DateTime, JSON
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import Base, UTC_NOW
 
 
 class DataQualityCheck(Base):
@@ -14,4 +14,4 @@ class DataQualityCheck(Base):
     table_name: Mapped[str] = mapped_column(String(100), nullable=False)
     status: Mapped[str] = mapped_column(String(20), nullable=False)  # passed, failed, warning
     details: Mapped[dict | None] = mapped_column(JSON)
-    executed_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    executed_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW, index=True)
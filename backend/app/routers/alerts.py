@@ -4,13 +4,14 @@ import math
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, field_validator
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.auth.dependencies import get_current_user
 from app.models.user import User
-from app.models.coin import DimCoin
 from app.models.alert import PriceAlert
+from app.services.coin_cache import get_coin_info, get_coin_infos
 
 router = APIRouter()
 
@@ -81,16 +82,16 @@ def get_alerts(
         .all()
     )
 
-    coins = {c.id: c for c in db.query(DimCoin).filter(DimCoin.id.in_([a.coin_id for a in alerts])).all()}
+    coins = get_coin_infos(db, [a.coin_id for a in alerts])
 
     return [
         AlertResponse(
             id=a.id,
             coin_id=a.coin_id,
-            coingecko_id=coins[a.coin_id].coingecko_id if a.coin_id in coins else "",
-            symbol=coins[a.coin_id].symbol if a.coin_id in coins else "",
-            name=coins[a.coin_id].name if a.coin_id in coins else "",
-            image_url=coins[a.coin_id].image_url if a.coin_id in coins else None,
+            coingecko_id=coins[a.coin_id]["coingecko_id"] if a.coin_id in coins else "",
+            symbol=coins[a.coin_id]["symbol"] if a.coin_id in coins else "",
+            name=coins[a.coin_id]["name"] if a.coin_id in coins else "",
+            image_url=coins[a.coin_id]["image_url"] if a.coin_id in coins else None,
             target_price=float(a.target_price),
             direction=a.direction,
             triggered=a.triggered,
@@ -109,7 +110,7 @@ def create_alert(
     db: Session = Depends(get_db),
 ):
     """Create a new price alert."""
-    coin = db.query(DimCoin).filter(DimCoin.id == data.coin_id).first()
+    coin = get_coin_info(db, data.coin_id, fresh=True)
     if not coin:
         raise HTTPException(status_code=404, detail="Coin not found")
 
@@ -132,16 +133,23 @@ def create_alert(
         direction=data.direction,
     )
     db.add(alert)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # The coin was deleted between the check and the insert
+        db.rollback()
+        if get_coin_info(db, data.coin_id, fresh=True) is None:
+            raise HTTPException(status_code=404, detail="Coin not found")
+        raise
     db.refresh(alert)
 
     return AlertResponse(
         id=alert.id,
         coin_id=alert.coin_id,
-        coingecko_id=coin.coingecko_id,
-        symbol=coin.symbol,
-        name=coin.name,
-        image_url=coin.image_url,
+        coingecko_id=coin["coingecko_id"],
+        symbol=coin["symbol"],
+        name=coin["name"],
+        image_url=coin["image_url"],
         target_price=float(alert.target_price),
         direction=alert.direction,
         triggered=alert.triggered,
@@ -198,14 +206,14 @@ def update_alert(
     db.commit()
     db.refresh(alert)
 
-    coin = db.query(DimCoin).filter(DimCoin.id == alert.coin_id).first()
+    coin = get_coin_info(db, alert.coin_id)
     return AlertResponse(
         id=alert.id,
         coin_id=alert.coin_id,
-        coingecko_id=coin.coingecko_id if coin else "",
-        symbol=coin.symbol if coin else "",
-        name=coin.name if coin else "",
-        image_url=coin.image_url if coin else None,
+        coingecko_id=coin["coingecko_id"] if coin else "",
+        symbol=coin["symbol"] if coin else "",
+        name=coin["name"] if coin else "",
+        image_url=coin["image_url"] if coin else None,
         target_price=float(alert.target_price),
         direction=alert.direction,
         triggered=alert.triggered,
@@ -238,16 +246,16 @@ def get_triggered_alerts(
         .all()
     )
 
-    coins = {c.id: c for c in db.query(DimCoin).filter(DimCoin.id.in_([a.coin_id for a in alerts])).all()}
+    coins = get_coin_infos(db, [a.coin_id for a in alerts])
 
     items = [
         AlertResponse(
             id=a.id,
             coin_id=a.coin_id,
-            coingecko_id=coins[a.coin_id].coingecko_id if a.coin_id in coins else "",
-            symbol=coins[a.coin_id].symbol if a.coin_id in coins else "",
-            name=coins[a.coin_id].name if a.coin_id in coins else "",
-            image_url=coins[a.coin_id].image_url if a.coin_id in coins else None,
+            coingecko_id=coins[a.coin_id]["coingecko_id"] if a.coin_id in coins else "",
+            symbol=coins[a.coin_id]["symbol"] if a.coin_id in coins else "",
+            name=coins[a.coin_id]["name"] if a.coin_id in coins else "",
+            image_url=coins[a.coin_id]["image_url"] if a.coin_id in coins else None,
             target_price=float(a.target_price),
             direction=a.direction,
             triggered=a.triggered,
@@ -277,7 +285,7 @@ def check_alerts(
 
     # Get latest prices
     latest = db.execute(text("SELECT coin_id, price_usd FROM mv_latest_market_data")).fetchall()
-    price_map = {r.coin_id: float(r.price_usd) for r in latest if r.price_usd is not None}
+    price_map = {r.coin_id: r.price_usd for r in latest if r.price_usd is not None}
 
     # Get untriggered alerts for the current user only
     alerts = (
@@ -287,8 +295,7 @@ def check_alerts(
     )
 
     # Batch-fetch all coins referenced by alerts (eliminates N+1 queries)
-    alert_coin_ids = list({a.coin_id for a in alerts})
-    coins = {c.id: c for c in db.query(DimCoin).filter(DimCoin.id.in_(alert_coin_ids)).all()} if alert_coin_ids else {}
+    coins = get_coin_infos(db, [a.coin_id for a in alerts])
 
     triggered = []
 
@@ -311,9 +318,9 @@ def check_alerts(
                 triggered.append({
                     "alert_id": alert.id,
                     "coin_id": alert.coin_id,
-                    "coingecko_id": coin.coingecko_id,
-                    "symbol": coin.symbol,
-                    "name": coin.name,
+                    "coingecko_id": coin["coingecko_id"],
+                    "symbol": coin["symbol"],
+                    "name": coin["name"],
                     "direction": alert.direction,
                     "target_price": float(alert.target_price),
                     "current_price": price,
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -6,9 +7,13 @@ from app.models.analytics import AnalyticsVolatility
 from app.models.coin import DimCoin
 from app.schemas.analytics import CorrelationMatrix, VolatilityEntry
 from app.services import analytics_service
+from app.utils.cache import cache_get, cache_set
 
 router = APIRouter()
 
+# Correlations and volatility are recomputed by the daily analytics job
+_ANALYTICS_CACHE_TTL = 300  # seconds
+
 
 @router.get("/correlation", response_model=CorrelationMatrix)
 def get_correlation(
@@ -17,8 +22,16 @@ def get_correlation(
     db: Session = Depends(get_db),
 ):
     """Get the price correlation matrix for top coins by market cap."""
-    data = analytics_service.get_correlation_matrix(db, period_days=period_days, top_n=top_n)
-    return CorrelationMatrix(**data)
+    cache_key = f"analytics:correlation:{period_days}:{top_n}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return CorrelationMatrix(**cached)
+
+    result = CorrelationMatrix(
+        **analytics_service.get_correlation_matrix(db, period_days=period_days, top_n=top_n)
+    )
+    cache_set(cache_key, result.model_dump(mode="json"), ttl=_ANALYTICS_CACHE_TTL)
+    return result
 
 
 @router.get("/volatility", response_model=list[VolatilityEntry])
@@ -27,8 +40,13 @@ def get_volatility(
     db: Session = Depends(get_db),
 ):
     """Get coins ranked by volatility over the given period."""
-    data = analytics_service.get_volatility_ranking(db, period_days=period_days)
-    return [VolatilityEntry(**entry) for entry in data]
+    cache_key = f"analytics:volatility:{period_days}"
+    data = cache_get(cache_key)
+    if data is None:
+        data = analytics_service.get_volatility_ranking(db, period_days=period_days)
+        cache_set(cache_key, data, ttl=_ANALYTICS_CACHE_TTL)
+    # Rows are already typed by the SQL casts; response_model only documents them
+    return ORJSONResponse(data)
 
 
 @router.get("/volatility/{coin_id}/history")
@@ -54,9 +72,9 @@ def get_volatility_history(
         "entries": [
             {
                 "period_days": e.period_days,
-                "volatility": float(e.volatility) if e.volatility else None,
-                "max_drawdown": float(e.max_drawdown) if e.max_drawdown else None,
-                "sharpe_ratio": float(e.sharpe_ratio) if e.sharpe_ratio else None,
+                "volatility": e.volatility or None,
+                "max_drawdown": e.max_drawdown or None,
+                "sharpe_ratio": e.sharpe_ratio or None,
                 "computed_at": e.computed_at.isoformat() if e.computed_at else None,
             }
             for e in entries
@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
 from app.schemas.auth import UserRegister, UserLogin, UserResponse, Token, PasswordChange, ForgotPasswordRequest, ResetPasswordRequest, WebhookUpdate
-from app.auth.jwt import hash_password, verify_password, create_access_token, decode_access_token_for_refresh
+from app.auth.jwt import hash_password, verify_password, password_needs_rehash, create_access_token, decode_access_token_for_refresh
 from app.auth.dependencies import get_current_user
 from app.config import settings
 from app.utils.url_validation import validate_webhook_url
@@ -67,6 +67,11 @@ def login(payload: UserLogin, request: Request, db: Session = Depends(get_db)):
             detail="Account is deactivated",
         )
 
+    # Transparently upgrade legacy bcrypt hashes to argon2id on successful login
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = hash_password(payload.password)
+        db.commit()
+
     access_token = create_access_token(data={"sub": str(user.id)})
     return Token(access_token=access_token)
 
@@ -2,15 +2,16 @@ import math
 from datetime import date, datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import text
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.coin import DimCoin
-from app.models.market_data import FactMarketData, FactDailyOHLCV
-from app.models.analytics import AnalyticsVolatility, AnalyticsCorrelation
-from app.schemas.coin import CoinResponse, CoinDetail, CoinHistory, PricePoint, CoinOHLCV, OHLCVPoint, SparklineData, CoinAnalytics, CorrelatedCoin
+from app.schemas.coin import CoinResponse, CoinDetail, CoinHistory, CoinOHLCV, SparklineData, CoinAnalytics, CorrelatedCoin
 from app.schemas.pagination import PaginatedResponse
+from app.services.market_service import get_latest_market_data
+from app.utils.cache import cache_get, cache_set
 
 router = APIRouter()
 
@@ -38,7 +39,24 @@ def list_categories(db: Session = Depends(get_db)):
     return [row[0] for row in rows]
 
 
-@router.get("", response_model=PaginatedResponse)
+_COUNT_CACHE_TTL = 60  # seconds
+# Market data comes from a materialized view refreshed every 10 minutes;
+# analytics are recomputed daily, so they can be cached for longer
+_RESPONSE_CACHE_TTL = 30
+_ANALYTICS_CACHE_TTL = 300
+_SPARKLINE_POINTS = 28
+
+_SORT_SQL_MAP = {
+    "market_cap_rank": "c.market_cap_rank",
+    "name": "c.name",
+    "price_usd": "m.price_usd",
+    "market_cap": "m.market_cap",
+    "total_volume": "m.total_volume",
+    "price_change_24h_pct": "m.price_change_24h_pct",
+}
+
+
+@router.get("", response_model=PaginatedResponse[CoinResponse])
 def list_coins(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
@@ -52,86 +70,66 @@ def list_coins(
     sort_by = _SORT_COLUMN_MAP.get(sort_by, "market_cap_rank")
     if sort_dir not in ("asc", "desc"):
         sort_dir = "asc"
+    # Whitespace-only search is no search; skip the ILIKE scan entirely
+    search = search.strip() if search else None
 
-    query = db.query(DimCoin)
+    cache_key = f"coins:list:{page}:{per_page}:{sort_by}:{sort_dir}:{category or ''}:{search or ''}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
 
+    conditions = []
+    params: dict = {}
     if search:
-        pattern = f"%{search.lower()}%"
-        query = query.filter(
-            (DimCoin.name.ilike(pattern)) | (DimCoin.symbol.ilike(pattern))
-        )
-
+        # Substring match served by the trigram GIN indexes; LIKE wildcards in
+        # the term are escaped so input like "%" cannot widen it to a full scan
+        conditions.append("(c.name ILIKE :pattern OR c.symbol ILIKE :pattern)")
+        escaped = search.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params["pattern"] = f"%{escaped}%"
     if category:
-        query = query.filter(DimCoin.category == category)
-
-    total = query.count()
+        conditions.append("c.category = :category")
+        params["category"] = category
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    # dim_coin changes only on ingestion, so unsearched counts are cached briefly
+    count_key = None if search else f"coins:count:{category or ''}"
+    total = cache_get(count_key) if count_key else None
+    if total is None:
+        total = db.execute(text(f"SELECT COUNT(*) FROM dim_coin c {where_sql}"), params).scalar()
+        if count_key:
+            cache_set(count_key, total, ttl=_COUNT_CACHE_TTL)
     pages = math.ceil(total / per_page) if total > 0 else 1
 
-    # For DimCoin-native fields, sort directly
-    if sort_by in ("market_cap_rank", "name"):
-        col = getattr(DimCoin, sort_by)
-        order = col.asc().nullslast() if sort_dir == "asc" else col.desc().nullslast()
-        coins = (
-            query
-            .order_by(order)
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
-        )
-    else:
-        # For market data fields, fetch all matching coin IDs, sort via materialized view
-        all_coin_ids = [c.id for c in query.with_entities(DimCoin.id).all()]
-        if all_coin_ids:
-            direction = "ASC" if sort_dir == "asc" else "DESC"
-            mv_rows = db.execute(
-                text(f"SELECT coin_id, price_usd, market_cap, total_volume, price_change_24h_pct FROM mv_latest_market_data WHERE coin_id = ANY(:ids) ORDER BY {sort_by} {direction} NULLS LAST"),
-                {"ids": all_coin_ids},
-            ).fetchall()
-            sorted_ids = [r.coin_id for r in mv_rows]
-            # Paginate the sorted IDs
-            page_ids = sorted_ids[(page - 1) * per_page : page * per_page]
-            coins_by_id = {c.id: c for c in db.query(DimCoin).filter(DimCoin.id.in_(page_ids)).all()}
-            coins = [coins_by_id[cid] for cid in page_ids if cid in coins_by_id]
-        else:
-            coins = []
-
-    # Fetch latest market data for the page of coins from the materialized view
-    coin_ids = [c.id for c in coins]
-    latest_rows = {}
-    if coin_ids:
-        rows = db.execute(
-            text("SELECT * FROM mv_latest_market_data WHERE coin_id = ANY(:ids)"),
-            {"ids": coin_ids},
-        ).fetchall()
-        latest_rows = {r.coin_id: r for r in rows}
-
-    items = []
-    for coin in coins:
-        latest = latest_rows.get(coin.id)
-        items.append(
-            CoinResponse(
-                id=coin.id,
-                coingecko_id=coin.coingecko_id,
-                symbol=coin.symbol,
-                name=coin.name,
-                category=coin.category,
-                image_url=coin.image_url,
-                market_cap_rank=coin.market_cap_rank,
-                created_at=coin.created_at,
-                price_usd=float(latest.price_usd) if latest and latest.price_usd else None,
-                market_cap=float(latest.market_cap) if latest and latest.market_cap else None,
-                total_volume=float(latest.total_volume) if latest and latest.total_volume else None,
-                price_change_24h_pct=float(latest.price_change_24h_pct) if latest and latest.price_change_24h_pct else None,
-            )
-        )
-
-    return PaginatedResponse(
-        items=items,
-        total=total,
-        page=page,
-        per_page=per_page,
-        pages=pages,
-    )
+    # Coin dimensions and latest market data in one round-trip; sort column and
+    # direction come from whitelists, never from raw user input
+    direction = "ASC" if sort_dir == "asc" else "DESC"
+    rows = db.execute(
+        text(f"""
+            SELECT
+                c.id, c.coingecko_id, c.symbol, c.name, c.category, c.image_url,
+                c.market_cap_rank, c.created_at,
+                m.price_usd, m.market_cap, m.total_volume, m.price_change_24h_pct
+            FROM dim_coin c
+            LEFT JOIN mv_latest_market_data m ON m.coin_id = c.id
+            {where_sql}
+            ORDER BY {_SORT_SQL_MAP[sort_by]} {direction} NULLS LAST, c.id
+            LIMIT :limit OFFSET :offset
+        """),
+        {**params, "limit": per_page, "offset": (page - 1) * per_page},
+    ).mappings().all()
+
+    # Rows come straight from our own tables, so they are returned as plain
+    # dicts; returning a Response skips response_model validation, which is
+    # kept only to document the shape in OpenAPI
+    result = {
+        "items": [dict(row) for row in rows],
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "pages": pages,
+    }
+    cache_set(cache_key, result, ttl=_RESPONSE_CACHE_TTL)
+    return ORJSONResponse(result)
 
 
 @router.get("/sparklines", response_model=list[SparklineData])
@@ -153,40 +151,51 @@ def get_sparklines(
 
     since = datetime.now(timezone.utc) - timedelta(days=7)
 
-    rows = (
-        db.query(FactMarketData.coin_id, FactMarketData.timestamp, FactMarketData.price_usd)
-        .filter(
-            FactMarketData.coin_id.in_(coin_ids),
-            FactMarketData.timestamp >= since,
-            FactMarketData.price_usd.isnot(None),
-        )
-        .order_by(FactMarketData.coin_id, FactMarketData.timestamp.asc())
-        .all()
-    )
-
-    # Group by coin and sample ~28 points (every 6th data point from 10-min intervals)
-    from collections import defaultdict
-    grouped: dict[int, list[float]] = defaultdict(list)
-    for coin_id, ts, price in rows:
-        grouped[coin_id].append(float(price))
-
-    result = []
-    for coin_id in coin_ids:
-        prices = grouped.get(coin_id, [])
-        # Sample down to ~28 points if we have more
-        if len(prices) > 28:
-            step = len(prices) / 28
-            sampled = [prices[int(i * step)] for i in range(28)]
-        else:
-            sampled = prices
-        result.append(SparklineData(coin_id=coin_id, prices=sampled))
-
-    return result
+    # Downsample in PostgreSQL: number each coin's rows and keep only the first
+    # row of each of ~28 equal-width position buckets (every 6th data point from
+    # 10-min intervals), so only the sampled points cross the wire
+    rows = db.execute(
+        text("""
+            WITH ranked AS (
+                SELECT
+                    coin_id,
+                    timestamp,
+                    price_usd,
+                    ROW_NUMBER() OVER (PARTITION BY coin_id ORDER BY timestamp) - 1 AS pos,
+                    COUNT(*) OVER (PARTITION BY coin_id) AS cnt
+                FROM fact_market_data
+                WHERE coin_id = ANY(:ids)
+                  AND timestamp >= :since
+                  AND price_usd IS NOT NULL
+            )
+            SELECT coin_id, price_usd::float8 AS price_usd
+            FROM ranked
+            WHERE cnt <= :points
+               OR pos = 0
+               OR (pos * :points) / cnt <> ((pos - 1) * :points) / cnt
+            ORDER BY coin_id, timestamp
+        """),
+        {"ids": coin_ids, "since": since, "points": _SPARKLINE_POINTS},
+    ).fetchall()
+
+    sampled_by_coin: dict[int, list[float]] = {}
+    for coin_id, price in rows:
+        sampled_by_coin.setdefault(coin_id, []).append(price)
+
+    return [
+        SparklineData(coin_id=coin_id, prices=sampled_by_coin.get(coin_id, []))
+        for coin_id in coin_ids
+    ]
 
 
 @router.get("/{coin_id}", response_model=CoinDetail)
 def get_coin(coin_id: int, db: Session = Depends(get_db)):
     """Get a single coin with its latest market data."""
+    cache_key = f"coins:detail:{coin_id}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     coin = db.query(DimCoin).filter(DimCoin.id == coin_id).first()
     if not coin:
         raise HTTPException(
@@ -194,12 +203,9 @@ def get_coin(coin_id: int, db: Session = Depends(get_db)):
             detail=f"Coin with id {coin_id} not found",
         )
 
-    latest_row = db.execute(
-        text("SELECT * FROM mv_latest_market_data WHERE coin_id = :cid"),
-        {"cid": coin.id},
-    ).fetchone()
+    latest = get_latest_market_data(db, [coin.id]).get(coin.id, {})
 
-    return CoinDetail(
+    result = CoinDetail(
         id=coin.id,
         coingecko_id=coin.coingecko_id,
         symbol=coin.symbol,
@@ -209,20 +215,35 @@ def get_coin(coin_id: int, db: Session = Depends(get_db)):
         image_url=coin.image_url,
         market_cap_rank=coin.market_cap_rank,
         created_at=coin.created_at,
-        price_usd=float(latest_row.price_usd) if latest_row and latest_row.price_usd else None,
-        market_cap=float(latest_row.market_cap) if latest_row and latest_row.market_cap else None,
-        total_volume=float(latest_row.total_volume) if latest_row and latest_row.total_volume else None,
-        price_change_24h_pct=float(latest_row.price_change_24h_pct) if latest_row and latest_row.price_change_24h_pct else None,
-        circulating_supply=float(latest_row.circulating_supply) if latest_row and latest_row.circulating_supply else None,
-        ath=float(coin.ath) if coin.ath is not None else None,
+        price_usd=latest.get("price_usd"),
+        market_cap=latest.get("market_cap"),
+        total_volume=latest.get("total_volume"),
+        price_change_24h_pct=latest.get("price_change_24h_pct"),
+        circulating_supply=latest.get("circulating_supply"),
+        ath=coin.ath,
         ath_date=coin.ath_date,
-        atl=float(coin.atl) if coin.atl is not None else None,
+        atl=coin.atl,
         atl_date=coin.atl_date,
-        total_supply=float(coin.total_supply) if coin.total_supply is not None else None,
-        max_supply=float(coin.max_supply) if coin.max_supply is not None else None,
-        high_24h=float(coin.high_24h) if coin.high_24h is not None else None,
-        low_24h=float(coin.low_24h) if coin.low_24h is not None else None,
+        total_supply=coin.total_supply,
+        max_supply=coin.max_supply,
+        high_24h=coin.high_24h,
+        low_24h=coin.low_24h,
     )
+    cache_set(cache_key, result.model_dump(mode="json"), ttl=_RESPONSE_CACHE_TTL)
+    return result
+
+
+def _get_coin_header(db: Session, coin_id: int):
+    """Fetch just (id, symbol, name) for a coin as a Core row, or raise 404."""
+    coin = db.execute(
+        select(DimCoin.id, DimCoin.symbol, DimCoin.name).where(DimCoin.id == coin_id)
+    ).first()
+    if not coin:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Coin with id {coin_id} not found",
+        )
+    return coin
 
 
 @router.get("/{coin_id}/history", response_model=CoinHistory)
@@ -232,39 +253,30 @@ def get_coin_history(
     db: Session = Depends(get_db),
 ):
     """Get historical price data for a coin from fact_market_data."""
-    coin = db.query(DimCoin).filter(DimCoin.id == coin_id).first()
-    if not coin:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Coin with id {coin_id} not found",
-        )
+    coin = _get_coin_header(db, coin_id)
 
     since = datetime.now(timezone.utc) - timedelta(days=days)
 
-    rows = (
-        db.query(FactMarketData)
-        .filter(
-            FactMarketData.coin_id == coin_id,
-            FactMarketData.timestamp >= since,
-        )
-        .order_by(FactMarketData.timestamp.asc())
-        .all()
-    )
-
-    prices = [
-        PricePoint(
-            timestamp=row.timestamp,
-            price_usd=float(row.price_usd) if row.price_usd is not None else None,
-        )
-        for row in rows
-    ]
-
-    return CoinHistory(
-        coin_id=coin.id,
-        symbol=coin.symbol,
-        name=coin.name,
-        prices=prices,
-    )
+    # Cast in SQL so the driver returns floats instead of Decimal objects
+    rows = db.execute(
+        text("""
+            SELECT timestamp, price_usd::float8 AS price_usd
+            FROM fact_market_data
+            WHERE coin_id = :coin_id AND timestamp >= :since
+              AND price_usd IS NOT NULL
+            ORDER BY timestamp ASC
+        """),
+        {"coin_id": coin_id, "since": since},
+    ).mappings().all()
+
+    # Hundreds of points per request: serialize the rows directly instead of
+    # building PricePoint models that response_model would validate again
+    return ORJSONResponse({
+        "coin_id": coin.id,
+        "symbol": coin.symbol,
+        "name": coin.name,
+        "prices": [dict(row) for row in rows],
+    })
 
 
 @router.get("/{coin_id}/ohlcv", response_model=CoinOHLCV)
@@ -274,43 +286,32 @@ def get_coin_ohlcv(
     db: Session = Depends(get_db),
 ):
     """Get daily OHLCV candlestick data for a coin from fact_daily_ohlcv."""
-    coin = db.query(DimCoin).filter(DimCoin.id == coin_id).first()
-    if not coin:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Coin with id {coin_id} not found",
-        )
+    coin = _get_coin_header(db, coin_id)
 
     since = date.today() - timedelta(days=days)
 
-    rows = (
-        db.query(FactDailyOHLCV)
-        .filter(
-            FactDailyOHLCV.coin_id == coin_id,
-            FactDailyOHLCV.date >= since,
-        )
-        .order_by(FactDailyOHLCV.date.asc())
-        .all()
-    )
-
-    candles = [
-        OHLCVPoint(
-            date=row.date,
-            open=float(row.open_price) if row.open_price is not None else None,
-            high=float(row.high_price) if row.high_price is not None else None,
-            low=float(row.low_price) if row.low_price is not None else None,
-            close=float(row.close_price) if row.close_price is not None else None,
-            volume=float(row.volume) if row.volume is not None else None,
-        )
-        for row in rows
-    ]
-
-    return CoinOHLCV(
-        coin_id=coin.id,
-        symbol=coin.symbol,
-        name=coin.name,
-        candles=candles,
-    )
+    rows = db.execute(
+        text("""
+            SELECT
+                date,
+                open_price::float8 AS open,
+                high_price::float8 AS high,
+                low_price::float8 AS low,
+                close_price::float8 AS close,
+                volume::float8 AS volume
+            FROM fact_daily_ohlcv
+            WHERE coin_id = :coin_id AND date >= :since
+            ORDER BY date ASC
+        """),
+        {"coin_id": coin_id, "since": since},
+    ).mappings().all()
+
+    return ORJSONResponse({
+        "coin_id": coin.id,
+        "symbol": coin.symbol,
+        "name": coin.name,
+        "candles": [dict(row) for row in rows],
+    })
 
 
 @router.get("/{coin_id}/analytics", response_model=CoinAnalytics)
@@ -320,75 +321,80 @@ def get_coin_analytics(
     db: Session = Depends(get_db),
 ):
     """Get risk metrics and correlation data for a coin."""
-    coin = db.query(DimCoin).filter(DimCoin.id == coin_id).first()
-    if not coin:
+    cache_key = f"coins:analytics:{coin_id}:{period_days}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    # One round trip: the coin with its risk metrics, plus the top/bottom 5
+    # correlated coins ranked in the database.
+    rows = db.execute(
+        text("""
+            WITH corr AS (
+                SELECT CASE WHEN coin_a_id = :coin_id THEN coin_b_id ELSE coin_a_id END AS other_id,
+                       correlation::float8 AS correlation
+                FROM analytics_correlation
+                WHERE period_days = :period_days
+                  AND (coin_a_id = :coin_id OR coin_b_id = :coin_id)
+                  AND correlation IS NOT NULL
+            ),
+            ranked AS (
+                SELECT other_id, correlation,
+                       ROW_NUMBER() OVER (ORDER BY correlation DESC) AS hi,
+                       ROW_NUMBER() OVER (ORDER BY correlation ASC) AS lo
+                FROM corr
+            )
+            SELECT d.id, d.symbol, d.name,
+                   v.volatility::float8 AS volatility,
+                   v.max_drawdown::float8 AS max_drawdown,
+                   v.sharpe_ratio::float8 AS sharpe_ratio,
+                   o.id AS other_id, o.symbol AS other_symbol, o.name AS other_name,
+                   o.image_url AS other_image_url, r.correlation, r.hi, r.lo
+            FROM dim_coin d
+            LEFT JOIN analytics_volatility v
+                ON v.coin_id = d.id AND v.period_days = :period_days
+            LEFT JOIN (
+                ranked r JOIN dim_coin o ON o.id = r.other_id
+            ) ON r.hi <= 5 OR r.lo <= 5
+            WHERE d.id = :coin_id
+        """),
+        {"coin_id": coin_id, "period_days": period_days},
+    ).mappings().all()
+
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Coin with id {coin_id} not found",
         )
 
-    # Fetch volatility/risk metrics
-    vol = (
-        db.query(AnalyticsVolatility)
-        .filter(
-            AnalyticsVolatility.coin_id == coin_id,
-            AnalyticsVolatility.period_days == period_days,
-        )
-        .first()
-    )
-
-    # Fetch correlations where this coin is either coin_a or coin_b
-    corr_rows = (
-        db.query(AnalyticsCorrelation)
-        .filter(
-            AnalyticsCorrelation.period_days == period_days,
-            (AnalyticsCorrelation.coin_a_id == coin_id)
-            | (AnalyticsCorrelation.coin_b_id == coin_id),
-            AnalyticsCorrelation.correlation.isnot(None),
-        )
-        .all()
-    )
-
-    # Build list of (other_coin_id, correlation)
-    pairs = []
-    for row in corr_rows:
-        other_id = row.coin_b_id if row.coin_a_id == coin_id else row.coin_a_id
-        pairs.append((other_id, float(row.correlation)))
-
-    # Sort: most correlated (highest) and least correlated (lowest)
-    pairs.sort(key=lambda x: x[1], reverse=True)
-    most_ids = pairs[:5]
-    least_ids = pairs[-5:][::-1] if len(pairs) >= 5 else pairs[::-1]  # reverse so least is first
-
-    # Load coin info for correlated coins
-    all_other_ids = list({cid for cid, _ in most_ids + least_ids})
-    other_coins = {}
-    if all_other_ids:
-        for c in db.query(DimCoin).filter(DimCoin.id.in_(all_other_ids)).all():
-            other_coins[c.id] = c
-
-    def build_correlated(pair_list: list[tuple[int, float]]) -> list[CorrelatedCoin]:
-        result = []
-        for cid, corr in pair_list:
-            c = other_coins.get(cid)
-            if c:
-                result.append(CorrelatedCoin(
-                    coin_id=c.id,
-                    symbol=c.symbol,
-                    name=c.name,
-                    image_url=c.image_url,
-                    correlation=round(corr, 4),
-                ))
-        return result
-
-    return CoinAnalytics(
-        coin_id=coin.id,
-        symbol=coin.symbol,
-        name=coin.name,
-        volatility=float(vol.volatility) if vol and vol.volatility is not None else None,
-        max_drawdown=float(vol.max_drawdown) if vol and vol.max_drawdown is not None else None,
-        sharpe_ratio=float(vol.sharpe_ratio) if vol and vol.sharpe_ratio is not None else None,
+    coin = rows[0]
+    correlated = [row for row in rows if row["other_id"] is not None]
+
+    def build_correlated(rank_key: str) -> list[CorrelatedCoin]:
+        return [
+            CorrelatedCoin(
+                coin_id=row["other_id"],
+                symbol=row["other_symbol"],
+                name=row["other_name"],
+                image_url=row["other_image_url"],
+                correlation=round(row["correlation"], 4),
+            )
+            for row in sorted(
+                (r for r in correlated if r[rank_key] <= 5),
+                key=lambda r: r[rank_key],
+            )
+        ]
+
+    result = CoinAnalytics(
+        coin_id=coin["id"],
+        symbol=coin["symbol"],
+        name=coin["name"],
+        volatility=coin["volatility"],
+        max_drawdown=coin["max_drawdown"],
+        sharpe_ratio=coin["sharpe_ratio"],
         period_days=period_days,
-        most_correlated=build_correlated(most_ids),
-        least_correlated=build_correlated(least_ids),
+        most_correlated=build_correlated("hi"),
+        least_correlated=build_correlated("lo"),
     )
+    cache_set(cache_key, result.model_dump(mode="json"), ttl=_ANALYTICS_CACHE_TTL)
+    return result
@@ -4,7 +4,7 @@ import time
 from datetime import datetime, timezone
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
 
 from app.database import SessionLocal
@@ -84,7 +84,7 @@ def readiness():
             overall = "degraded"
 
     status_code = 200 if overall in ("healthy", "degraded") else 503
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content={"status": overall, "checks": checks},
     )
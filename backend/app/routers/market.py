@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
@@ -12,8 +13,8 @@ router = APIRouter()
 @router.get("/overview", response_model=MarketOverview)
 def market_overview(db: Session = Depends(get_db)):
     """Get a high-level overview of the crypto market."""
-    data = market_service.get_market_overview(db)
-    return MarketOverview(**data)
+    # Built from our own tables; skip re-validating it against MarketOverview
+    return ORJSONResponse(market_service.get_market_overview(db))
 
 
 @router.get("/kpi-sparklines", response_model=KpiSparklineResponse)
@@ -42,8 +43,8 @@ def get_sector_performance(db: Session = Depends(get_db)):
     return [
         {
             "category": row.category,
-            "avg_change_24h": float(row.avg_change_24h) if row.avg_change_24h is not None else 0,
-            "total_market_cap": float(row.total_market_cap) if row.total_market_cap is not None else 0,
+            "avg_change_24h": row.avg_change_24h if row.avg_change_24h is not None else 0,
+            "total_market_cap": row.total_market_cap if row.total_market_cap is not None else 0,
             "coin_count": row.coin_count,
         }
         for row in rows
@@ -73,13 +74,12 @@ def get_market_summary(
 @router.get("/sentiment")
 async def get_market_sentiment():
     """Get the Fear & Greed Index (cached for 1 hour)."""
-    from fastapi.responses import JSONResponse
     from app.services.sentiment_service import get_fear_greed_index
 
     try:
         return await get_fear_greed_index()
     except Exception:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={"detail": "Sentiment data temporarily unavailable"},
             headers={"Retry-After": "300"},
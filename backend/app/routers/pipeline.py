@@ -1,8 +1,8 @@
-import math
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func
+from pydantic import TypeAdapter
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -10,15 +10,29 @@ from app.models.pipeline import PipelineRun
 from app.models.market_data import FactMarketData
 from app.schemas.pipeline import PipelineRunResponse, PipelineHealth
 from app.schemas.pagination import PaginatedResponse
+from app.utils.cache import cache_get, cache_set
+from app.utils.pagination import paginate_keyset
 
 router = APIRouter()
 
+# Built once: validates a whole page in a single call
+_RUN_LIST_ADAPTER = TypeAdapter(list[PipelineRunResponse])
 
-@router.get("/runs", response_model=PaginatedResponse)
+_RUNS_COUNT_CACHE_TTL = 300
+
+# Health only changes when a DAG run finishes; dashboards poll far more often.
+# Every DAG and cron job deletes this key when it logs a run
+# (pipelines/plugins/api_cache.py); the TTL covers freshness drifting past 60 min
+_HEALTH_CACHE_KEY = "pipeline:health"
+_HEALTH_CACHE_TTL = 20
+
+
+@router.get("/runs", response_model=PaginatedResponse[PipelineRunResponse])
 def list_pipeline_runs(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     dag_id: str | None = Query(None, description="Filter by DAG id"),
+    cursor: str | None = Query(None, description="Keyset cursor (next_cursor of the previous page); takes precedence over page"),
     db: Session = Depends(get_db),
 ):
     """List pipeline runs with optional filtering by DAG id."""
@@ -27,73 +41,63 @@ def list_pipeline_runs(
     if dag_id:
         query = query.filter(PipelineRun.dag_id == dag_id)
 
-    total = query.count()
-    pages = math.ceil(total / per_page) if total > 0 else 1
-
-    runs = (
-        query
-        .order_by(PipelineRun.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-        .all()
+    result = paginate_keyset(
+        query, PipelineRun.created_at, PipelineRun.id,
+        page=page, per_page=per_page, cursor=cursor,
+        count_key=f"pipeline:runs:count:{dag_id or ''}", count_ttl=_RUNS_COUNT_CACHE_TTL,
     )
 
-    items = [PipelineRunResponse.model_validate(run) for run in runs]
-
-    return PaginatedResponse(
-        items=items,
-        total=total,
-        page=page,
+    return PaginatedResponse[PipelineRunResponse](
+        items=_RUN_LIST_ADAPTER.validate_python(result.rows, from_attributes=True),
+        total=result.total,
+        page=result.page,
         per_page=per_page,
-        pages=pages,
+        pages=result.pages,
+        next_cursor=result.next_cursor,
     )
 
 
 @router.get("/health", response_model=list[PipelineHealth])
 def pipeline_health(db: Session = Depends(get_db)):
     """Return the health status for each DAG based on its most recent run."""
-    # Get distinct DAG ids
-    dag_ids = [
-        row[0]
-        for row in db.query(PipelineRun.dag_id).distinct().all()
-    ]
+    cached = cache_get(_HEALTH_CACHE_KEY)
+    if cached is not None:
+        return cached
+
+    # Latest run per DAG in one query instead of one lookup per DAG
+    last_runs = db.execute(text("""
+        SELECT DISTINCT ON (dag_id) dag_id, status, start_time, end_time
+        FROM pipeline_runs
+        ORDER BY dag_id, created_at DESC
+    """)).fetchall()
 
     # Most recent data timestamp for freshness calculation
     latest_data_ts = db.query(func.max(FactMarketData.timestamp)).scalar()
     now = datetime.now(timezone.utc)
 
-    results = []
-    for dag in dag_ids:
-        last_run = (
-            db.query(PipelineRun)
-            .filter(PipelineRun.dag_id == dag)
-            .order_by(PipelineRun.created_at.desc())
-            .first()
-        )
-
-        freshness_minutes = None
-        if latest_data_ts:
-            aware_ts = latest_data_ts if latest_data_ts.tzinfo else latest_data_ts.replace(tzinfo=timezone.utc)
-            freshness_minutes = round((now - aware_ts).total_seconds() / 60, 1)
-
-        last_status = last_run.status if last_run else None
-        last_time = last_run.end_time or last_run.start_time if last_run else None
+    freshness_minutes = None
+    if latest_data_ts:
+        aware_ts = latest_data_ts if latest_data_ts.tzinfo else latest_data_ts.replace(tzinfo=timezone.utc)
+        freshness_minutes = round((now - aware_ts).total_seconds() / 60, 1)
 
+    results = []
+    for last_run in last_runs:
         # A DAG is healthy if its last run succeeded and data is reasonably fresh (<60 min)
         is_healthy = (
-            last_status == "success"
+            last_run.status == "success"
             and freshness_minutes is not None
             and freshness_minutes < 60
         )
 
         results.append(
             PipelineHealth(
-                dag_id=dag,
-                last_run_status=last_status,
-                last_run_time=last_time,
+                dag_id=last_run.dag_id,
+                last_run_status=last_run.status,
+                last_run_time=last_run.end_time or last_run.start_time,
                 data_freshness_minutes=freshness_minutes,
                 is_healthy=is_healthy,
             )
         )
 
+    cache_set(_HEALTH_CACHE_KEY, [r.model_dump(mode="json") for r in results], ttl=_HEALTH_CACHE_TTL)
     return results
@@ -2,10 +2,11 @@ import csv
 import io
 from datetime import date, datetime, timedelta, timezone
 
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.database import get_db
 from app.auth.dependencies import get_current_user
@@ -18,61 +19,74 @@ from app.schemas.portfolio import (
     HoldingUpdate,
     HoldingResponse,
     PortfolioSummary,
-    PerformancePoint,
     PortfolioPerformance,
 )
+from app.services.market_service import get_latest_market_data
 
 router = APIRouter()
 
 
-def _enrich_holding(holding: PortfolioHolding, coin: DimCoin, current_price: float | None) -> HoldingResponse:
-    quantity = float(holding.quantity)
-    buy_price = float(holding.buy_price_usd)
+def _enrich_holdings(holdings: list[PortfolioHolding], prices: dict[int, float | None]) -> list[HoldingResponse]:
+    """Build HoldingResponses, computing value and P&L for all holdings as arrays."""
+    n = len(holdings)
+    quantity = np.fromiter((float(h.quantity) for h in holdings), dtype=np.float64, count=n)
+    buy_price = np.fromiter((float(h.buy_price_usd) for h in holdings), dtype=np.float64, count=n)
+    # Missing prices become NaN and propagate through value and P&L
+    current_price = np.array([prices.get(h.coin_id) for h in holdings], dtype=np.float64)
+
     cost_basis = quantity * buy_price
-    current_value = quantity * current_price if current_price is not None else None
-    pnl_usd = current_value - cost_basis if current_value is not None else None
-    pnl_pct = (pnl_usd / cost_basis * 100) if pnl_usd is not None and cost_basis > 0 else None
-
-    return HoldingResponse(
-        id=holding.id,
-        coin_id=holding.coin_id,
-        coingecko_id=coin.coingecko_id,
-        symbol=coin.symbol,
-        name=coin.name,
-        image_url=coin.image_url,
-        quantity=quantity,
-        buy_price_usd=buy_price,
-        current_price_usd=current_price,
-        current_value_usd=current_value,
-        cost_basis_usd=cost_basis,
-        pnl_usd=pnl_usd,
-        pnl_pct=pnl_pct,
-        notes=holding.notes,
-        created_at=holding.created_at,
-        updated_at=holding.updated_at,
-    )
+    current_value = quantity * current_price
+    pnl_usd = current_value - cost_basis
+    pnl_pct = np.divide(pnl_usd, cost_basis, out=np.full(n, np.nan), where=cost_basis > 0) * 100
+
+    def _or_none(values: np.ndarray) -> list[float | None]:
+        return [None if v != v else v for v in values.tolist()]
+
+    return [
+        HoldingResponse(
+            id=h.id,
+            coin_id=h.coin_id,
+            coingecko_id=h.coin.coingecko_id,
+            symbol=h.coin.symbol,
+            name=h.coin.name,
+            image_url=h.coin.image_url,
+            quantity=qty,
+            buy_price_usd=buy,
+            current_price_usd=price,
+            current_value_usd=value,
+            cost_basis_usd=cost,
+            pnl_usd=pnl,
+            pnl_pct=pct,
+            notes=h.notes,
+            created_at=h.created_at,
+            updated_at=h.updated_at,
+        )
+        for h, qty, buy, price, value, cost, pnl, pct in zip(
+            holdings,
+            quantity.tolist(),
+            buy_price.tolist(),
+            _or_none(current_price),
+            _or_none(current_value),
+            cost_basis.tolist(),
+            _or_none(pnl_usd),
+            _or_none(pnl_pct),
+        )
+    ]
 
 
-def _get_prices_and_coins(db: Session, coin_ids: list[int]):
-    """Batch-fetch current prices and coin info for a list of coin_ids."""
-    prices: dict[int, float | None] = {}
-    coins: dict[int, DimCoin] = {}
-    if not coin_ids:
-        return prices, coins
+def _downsample_indices(n: int, max_points: int) -> np.ndarray:
+    """Evenly strided indices selecting at most ``max_points`` of ``n`` items."""
+    if n <= max_points:
+        return np.arange(n)
+    return (np.arange(max_points) * (n / max_points)).astype(np.int64)
 
-    # Prices from materialized view
-    rows = db.execute(
-        text("SELECT coin_id, price_usd FROM mv_latest_market_data WHERE coin_id = ANY(:ids)"),
-        {"ids": coin_ids},
-    ).fetchall()
-    for r in rows:
-        prices[r.coin_id] = float(r.price_usd) if r.price_usd is not None else None
 
-    # Coin info
-    for c in db.query(DimCoin).filter(DimCoin.id.in_(coin_ids)).all():
-        coins[c.id] = c
+def _get_prices(db: Session, coin_ids: list[int]) -> dict[int, float | None]:
+    """Batch-fetch current prices for a list of coin_ids.
 
-    return prices, coins
+    Coin info comes with the holdings themselves via ``joinedload(PortfolioHolding.coin)``.
+    """
+    return {cid: row["price_usd"] for cid, row in get_latest_market_data(db, coin_ids).items()}
 
 
 @router.get("", response_model=PortfolioSummary)
@@ -98,7 +112,7 @@ def get_portfolio_summary(
         )
 
     coin_ids = list({h.coin_id for h in holdings})
-    prices, _ = _get_prices_and_coins(db, coin_ids)
+    prices = _get_prices(db, coin_ids)
 
     total_value = 0.0
     total_cost = 0.0
@@ -133,6 +147,7 @@ def get_holdings(
     """Get all holdings with enriched coin data and current prices."""
     holdings = (
         db.query(PortfolioHolding)
+        .options(joinedload(PortfolioHolding.coin))
         .filter(PortfolioHolding.user_id == current_user.id)
         .order_by(PortfolioHolding.created_at.desc())
         .all()
@@ -142,13 +157,9 @@ def get_holdings(
         return []
 
     coin_ids = list({h.coin_id for h in holdings})
-    prices, coins = _get_prices_and_coins(db, coin_ids)
+    prices = _get_prices(db, coin_ids)
 
-    return [
-        _enrich_holding(h, coins[h.coin_id], prices.get(h.coin_id))
-        for h in holdings
-        if h.coin_id in coins
-    ]
+    return _enrich_holdings(holdings, prices)
 
 
 @router.post("/holdings", response_model=HoldingResponse, status_code=status.HTTP_201_CREATED)
@@ -164,17 +175,18 @@ def add_holding(
 
     holding = PortfolioHolding(
         user_id=current_user.id,
-        coin_id=data.coin_id,
+        coin=coin,
         quantity=data.quantity,
         buy_price_usd=data.buy_price_usd,
         notes=data.notes,
     )
     db.add(holding)
+    # Flush returns the id and timestamps; build the response from the objects
+    # already in the session before commit expires them
+    db.flush()
+    response = _enrich_holdings([holding], _get_prices(db, [coin.id]))[0]
     db.commit()
-    db.refresh(holding)
-
-    prices, _ = _get_prices_and_coins(db, [data.coin_id])
-    return _enrich_holding(holding, coin, prices.get(data.coin_id))
+    return response
 
 
 @router.put("/holdings/{holding_id}", response_model=HoldingResponse)
@@ -187,6 +199,7 @@ def update_holding(
     """Update a holding (only own holdings)."""
     holding = (
         db.query(PortfolioHolding)
+        .options(joinedload(PortfolioHolding.coin))
         .filter(PortfolioHolding.id == holding_id, PortfolioHolding.user_id == current_user.id)
         .first()
     )
@@ -200,14 +213,10 @@ def update_holding(
     if data.notes is not None:
         holding.notes = data.notes
 
+    db.flush()
+    response = _enrich_holdings([holding], _get_prices(db, [holding.coin_id]))[0]
     db.commit()
-    db.refresh(holding)
-
-    coin = db.query(DimCoin).filter(DimCoin.id == holding.coin_id).first()
-    if not coin:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coin no longer exists")
-    prices, _ = _get_prices_and_coins(db, [holding.coin_id])
-    return _enrich_holding(holding, coin, prices.get(holding.coin_id))
+    return response
 
 
 @router.delete("/holdings/{holding_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -246,6 +255,7 @@ def get_portfolio_insights(
     """Generate AI-powered portfolio insights."""
     holdings = (
         db.query(PortfolioHolding)
+        .options(joinedload(PortfolioHolding.coin))
         .filter(PortfolioHolding.user_id == current_user.id)
         .all()
     )
@@ -254,16 +264,14 @@ def get_portfolio_insights(
         return {"insights": "Add holdings to your portfolio to get AI-powered insights."}
 
     coin_ids = list({h.coin_id for h in holdings})
-    prices, coins = _get_prices_and_coins(db, coin_ids)
+    prices = _get_prices(db, coin_ids)
 
     total_value = 0.0
     total_cost = 0.0
     holdings_data = []
 
     for h in holdings:
-        coin = coins.get(h.coin_id)
-        if not coin:
-            continue
+        coin = h.coin
         qty = float(h.quantity)
         buy_price = float(h.buy_price_usd) if h.buy_price_usd else 0.0
         current_price = prices.get(h.coin_id, 0)
@@ -305,13 +313,14 @@ def export_portfolio_csv(
     try:
         holdings = (
             db.query(PortfolioHolding)
+            .options(joinedload(PortfolioHolding.coin))
             .filter(PortfolioHolding.user_id == current_user.id)
             .order_by(PortfolioHolding.created_at.desc())
             .all()
         )
 
         coin_ids = list({h.coin_id for h in holdings})
-        prices, coins = _get_prices_and_coins(db, coin_ids)
+        prices = _get_prices(db, coin_ids)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -349,9 +358,7 @@ def export_portfolio_csv(
     worst_coin = ""
 
     for h in holdings:
-        coin = coins.get(h.coin_id)
-        if not coin:
-            continue
+        coin = h.coin
         qty = float(h.quantity)
         buy_price = float(h.buy_price_usd) if h.buy_price_usd is not None else 0.0
         current_price = prices.get(h.coin_id)
@@ -455,7 +462,7 @@ def get_portfolio_performance(
             )
             SELECT
                 b.bucket,
-                SUM(h.qty * b.avg_price) AS portfolio_value
+                SUM(h.qty * b.avg_price)::float8 AS portfolio_value
             FROM buckets b
             JOIN (
                 SELECT
@@ -480,20 +487,14 @@ def get_portfolio_performance(
     if not rows:
         return PortfolioPerformance(days=days, data_points=[])
 
+    # Downsample to ~200 points; plain dicts go straight to orjson instead of
+    # PerformancePoint models that response_model would validate a second time
     data_points = [
-        PerformancePoint(
-            timestamp=row.bucket.isoformat(),
-            value_usd=round(float(row.portfolio_value), 2),
-        )
-        for row in rows
+        {"timestamp": rows[i].bucket.isoformat(), "value_usd": round(rows[i].portfolio_value, 2)}
+        for i in _downsample_indices(len(rows), 200)
     ]
 
-    # Downsample to ~200 points if needed
-    if len(data_points) > 200:
-        step = len(data_points) / 200
-        data_points = [data_points[int(i * step)] for i in range(200)]
-
-    return PortfolioPerformance(days=days, data_points=data_points)
+    return ORJSONResponse({"days": days, "data_points": data_points})
 
 
 @router.get("/history")
@@ -523,7 +524,7 @@ def get_portfolio_history(
         SELECT
             date_trunc('hour', timestamp) AS bucket,
             coin_id,
-            AVG(price_usd) AS avg_price
+            AVG(price_usd)::float8 AS avg_price
         FROM fact_market_data
         WHERE coin_id = ANY(:coin_ids)
           AND timestamp >= :since
@@ -535,26 +536,25 @@ def get_portfolio_history(
     if not rows:
         return []
 
-    # Aggregate: sum(quantity * avg_price) per bucket
-    from collections import defaultdict
-    bucket_values: dict[datetime, float] = defaultdict(float)
-    for row in rows:
-        qty = coin_quantities.get(row.coin_id, 0.0)
-        bucket_values[row.bucket] += qty * float(row.avg_price)
+    # Aggregate sum(quantity * avg_price) per bucket in NumPy: map each row to
+    # its bucket index, then a weighted bincount sums the per-coin values
+    n = len(rows)
+    prices = np.fromiter((row.avg_price for row in rows), dtype=np.float64, count=n)
+    qty = np.fromiter((coin_quantities.get(row.coin_id, 0.0) for row in rows), dtype=np.float64, count=n)
+    bucket_ts = np.array([row.bucket for row in rows], dtype="datetime64[us]")
+    buckets, bucket_idx = np.unique(bucket_ts, return_inverse=True)
+    values = np.bincount(bucket_idx, weights=qty * prices, minlength=len(buckets))
 
-    data_points = [
+    positive = values > 0
+    buckets, values = buckets[positive], values[positive]
+
+    # Downsample to ~300 points max before building the response dicts
+    idx = _downsample_indices(len(values), 300)
+    return [
         {"timestamp": bucket.isoformat(), "value": round(value, 2)}
-        for bucket, value in sorted(bucket_values.items())
-        if value > 0
+        for bucket, value in zip(buckets[idx].tolist(), values[idx].tolist())
     ]
 
-    # Downsample to ~300 points max
-    if len(data_points) > 300:
-        step = len(data_points) / 300
-        data_points = [data_points[int(i * step)] for i in range(300)]
-
-    return data_points
-
 
 @router.get("/benchmark")
 def get_benchmark(
@@ -582,9 +582,9 @@ def get_benchmark(
     if not rows:
         return {"symbol": symbol.upper(), "days": days, "data_points": []}
 
-    base_price = float(rows[0].price_usd)
+    base_price = rows[0].price_usd
     points = [
-        {"timestamp": r.timestamp.isoformat(), "value": round(float(r.price_usd) / base_price * 100, 2)}
+        {"timestamp": r.timestamp.isoformat(), "value": round(r.price_usd / base_price * 100, 2)}
         for r in rows
     ]
 
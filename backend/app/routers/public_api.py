@@ -1,7 +1,6 @@
 """Public API endpoints — no authentication required, rate-limited per IP."""
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -53,14 +52,7 @@ def public_coins(
         .all()
     )
 
-    coin_ids = [c.id for c in coins]
-    latest = {}
-    if coin_ids:
-        rows = db.execute(
-            text("SELECT * FROM mv_latest_market_data WHERE coin_id = ANY(:ids)"),
-            {"ids": coin_ids},
-        ).fetchall()
-        latest = {r.coin_id: r for r in rows}
+    latest = market_service.get_latest_market_data(db, [c.id for c in coins])
 
     items = [
         {
@@ -68,10 +60,10 @@ def public_coins(
             "symbol": c.symbol,
             "name": c.name,
             "market_cap_rank": c.market_cap_rank,
-            "price_usd": float(latest[c.id].price_usd) if c.id in latest and latest[c.id].price_usd else None,
-            "market_cap": float(latest[c.id].market_cap) if c.id in latest and latest[c.id].market_cap else None,
-            "total_volume": float(latest[c.id].total_volume) if c.id in latest and latest[c.id].total_volume else None,
-            "price_change_24h_pct": float(latest[c.id].price_change_24h_pct) if c.id in latest and latest[c.id].price_change_24h_pct else None,
+            "price_usd": latest.get(c.id, {}).get("price_usd"),
+            "market_cap": latest.get(c.id, {}).get("market_cap"),
+            "total_volume": latest.get(c.id, {}).get("total_volume"),
+            "price_change_24h_pct": latest.get(c.id, {}).get("price_change_24h_pct"),
         }
         for c in coins
     ]
@@ -98,10 +90,7 @@ def public_coin(
     if not coin:
         raise HTTPException(status_code=404, detail="Coin not found")
 
-    latest = db.execute(
-        text("SELECT * FROM mv_latest_market_data WHERE coin_id = :cid"),
-        {"cid": coin.id},
-    ).fetchone()
+    latest = market_service.get_latest_market_data(db, [coin.id]).get(coin.id, {})
 
     return {
         "id": coin.id,
@@ -110,11 +99,11 @@ def public_coin(
         "name": coin.name,
         "category": coin.category,
         "market_cap_rank": coin.market_cap_rank,
-        "price_usd": float(latest.price_usd) if latest and latest.price_usd else None,
-        "market_cap": float(latest.market_cap) if latest and latest.market_cap else None,
-        "total_volume": float(latest.total_volume) if latest and latest.total_volume else None,
-        "price_change_24h_pct": float(latest.price_change_24h_pct) if latest and latest.price_change_24h_pct else None,
-        "circulating_supply": float(latest.circulating_supply) if latest and latest.circulating_supply else None,
+        "price_usd": latest.get("price_usd"),
+        "market_cap": latest.get("market_cap"),
+        "total_volume": latest.get("total_volume"),
+        "price_change_24h_pct": latest.get("price_change_24h_pct"),
+        "circulating_supply": latest.get("circulating_supply"),
     }
 
 
@@ -1,6 +1,5 @@
-import math
-
 from fastapi import APIRouter, Depends, Query
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -8,16 +7,23 @@ from app.models.quality import DataQualityCheck
 from app.schemas.quality import QualityCheckResponse, QualitySummary
 from app.schemas.pagination import PaginatedResponse
 from app.services import quality_service
+from app.utils.pagination import paginate_keyset
 
 router = APIRouter()
 
+# Built once: validates a whole page in a single call
+_CHECK_LIST_ADAPTER = TypeAdapter(list[QualityCheckResponse])
+
+_CHECKS_COUNT_CACHE_TTL = 300
+
 
-@router.get("/checks", response_model=PaginatedResponse)
+@router.get("/checks", response_model=PaginatedResponse[QualityCheckResponse])
 def list_quality_checks(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     status: str | None = Query(None, description="Filter by status (passed, failed, warning)"),
     table_name: str | None = Query(None, description="Filter by table name"),
+    cursor: str | None = Query(None, description="Keyset cursor (next_cursor of the previous page); takes precedence over page"),
     db: Session = Depends(get_db),
 ):
     """List data quality checks with optional filtering."""
@@ -28,25 +34,20 @@ def list_quality_checks(
     if table_name:
         query = query.filter(DataQualityCheck.table_name == table_name)
 
-    total = query.count()
-    pages = math.ceil(total / per_page) if total > 0 else 1
-
-    checks = (
-        query
-        .order_by(DataQualityCheck.executed_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-        .all()
+    result = paginate_keyset(
+        query, DataQualityCheck.executed_at, DataQualityCheck.id,
+        page=page, per_page=per_page, cursor=cursor,
+        count_key=f"quality:checks:count:{status or ''}:{table_name or ''}",
+        count_ttl=_CHECKS_COUNT_CACHE_TTL,
     )
 
-    items = [QualityCheckResponse.model_validate(check) for check in checks]
-
-    return PaginatedResponse(
-        items=items,
-        total=total,
-        page=page,
+    return PaginatedResponse[QualityCheckResponse](
+        items=_CHECK_LIST_ADAPTER.validate_python(result.rows, from_attributes=True),
+        total=result.total,
+        page=result.page,
         per_page=per_page,
-        pages=pages,
+        pages=result.pages,
+        next_cursor=result.next_cursor,
     )
 
 
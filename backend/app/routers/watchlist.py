@@ -1,15 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.auth.dependencies import get_current_user
 from app.models.user import User
-from app.models.coin import DimCoin
 from app.models.watchlist import UserWatchlist
 from app.schemas.watchlist import WatchlistResponse
+from app.services.coin_cache import get_coin_info
+from app.utils.cache import cache_get, cache_set
 
 router = APIRouter()
 
+# Watchlists change only through this router, which writes the new list through
+# after every commit. A GET that read the old rows just before a commit can still
+# store them after that write; the short TTL bounds how long such a list survives.
+_WATCHLIST_CACHE_TTL = 30
+
+
+def _cache_key(user_id: int) -> str:
+    return f"watchlist:{user_id}"
+
+
+def _load_watchlist(db: Session, user_id: int) -> list[int]:
+    """Read a user's watchlist coin IDs from the DB and store them in the cache."""
+    coin_ids = list(db.execute(
+        select(UserWatchlist.coin_id)
+        .where(UserWatchlist.user_id == user_id)
+        .order_by(UserWatchlist.created_at.asc())
+    ).scalars())
+    cache_set(_cache_key(user_id), coin_ids, ttl=_WATCHLIST_CACHE_TTL)
+    return coin_ids
+
 
 @router.get("", response_model=WatchlistResponse)
 def get_watchlist(
@@ -17,13 +40,10 @@ def get_watchlist(
     db: Session = Depends(get_db),
 ):
     """Get the current user's watchlist coin IDs."""
-    rows = (
-        db.query(UserWatchlist.coin_id)
-        .filter(UserWatchlist.user_id == current_user.id)
-        .order_by(UserWatchlist.created_at.asc())
-        .all()
-    )
-    return WatchlistResponse(coin_ids=[r.coin_id for r in rows])
+    coin_ids = cache_get(_cache_key(current_user.id))
+    if coin_ids is None:
+        coin_ids = _load_watchlist(db, current_user.id)
+    return WatchlistResponse(coin_ids=coin_ids)
 
 
 @router.post("/{coin_id}", status_code=status.HTTP_201_CREATED)
@@ -33,8 +53,7 @@ def add_to_watchlist(
     db: Session = Depends(get_db),
 ):
     """Add a coin to the current user's watchlist."""
-    coin = db.query(DimCoin).filter(DimCoin.id == coin_id).first()
-    if not coin:
+    if get_coin_info(db, coin_id, fresh=True) is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coin not found")
 
     existing = (
@@ -47,7 +66,15 @@ def add_to_watchlist(
 
     entry = UserWatchlist(user_id=current_user.id, coin_id=coin_id)
     db.add(entry)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # The coin was deleted between the check and the insert
+        db.rollback()
+        if get_coin_info(db, coin_id, fresh=True) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coin not found")
+        raise
+    _load_watchlist(db, current_user.id)
     return {"detail": "Added to watchlist"}
 
 
@@ -66,4 +93,5 @@ def remove_from_watchlist(
     db.commit()
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coin not in watchlist")
+    _load_watchlist(db, current_user.id)
     return None
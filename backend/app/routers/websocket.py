@@ -2,6 +2,7 @@ import asyncio
 import logging
 import time
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.config import settings
@@ -11,6 +12,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Constant frame, encoded once rather than on every idle timeout
+_HEARTBEAT_FRAME = orjson.dumps({"type": "heartbeat"}).decode()
+
 
 @router.websocket("/prices")
 async def websocket_prices(websocket: WebSocket, user_id: int | None = None):
@@ -20,9 +24,9 @@ async def websocket_prices(websocket: WebSocket, user_id: int | None = None):
         while True:
             try:
                 data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-                await websocket.send_json({"type": "ack", "payload": data})
+                await websocket.send_text(orjson.dumps({"type": "ack", "payload": data}).decode())
             except asyncio.TimeoutError:
-                await websocket.send_json({"type": "heartbeat"})
+                await websocket.send_text(_HEARTBEAT_FRAME)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception:
@@ -4,9 +4,12 @@ from pydantic import Field
 
 T = TypeVar("T")
 
-class PaginatedResponse(BaseModel):
-    items: list
+class PaginatedResponse(BaseModel, Generic[T]):
+    items: list[T]
     total: int
-    page: int
+    # None when the page was fetched by cursor, where page numbers don't apply
+    page: int | None
     per_page: int
-    pages: int
+    pages: int | None
+    # Keyset cursor for the next page, on endpoints that support it
+    next_cursor: str | None = None
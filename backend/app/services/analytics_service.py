@@ -1,49 +1,55 @@
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select, text
 
 from app.models.coin import DimCoin
-from app.models.analytics import AnalyticsCorrelation, AnalyticsVolatility
+from app.models.analytics import AnalyticsCorrelation
 
 
 def get_correlation_matrix(db: Session, period_days: int = 30, top_n: int = 15) -> dict:
     """Return correlation matrix for top coins by market cap."""
-    coins = (
-        db.query(DimCoin)
-        .filter(DimCoin.market_cap_rank.isnot(None))
+    # Read-only projections: Core rows skip ORM hydration and the identity map
+    coins = db.execute(
+        select(DimCoin.id, DimCoin.symbol)
+        .where(DimCoin.market_cap_rank.isnot(None))
         .order_by(DimCoin.market_cap_rank)
         .limit(top_n)
-        .all()
-    )
-    coin_map = {c.id: c.symbol for c in coins}
+    ).all()
     coin_ids = [c.id for c in coins]
     symbols = [c.symbol for c in coins]
 
-    correlations = (
-        db.query(AnalyticsCorrelation)
-        .filter(AnalyticsCorrelation.period_days == period_days)
-        .all()
-    )
+    # The matrix is symmetric with a unit diagonal, so only the upper triangle
+    # among the selected coins is fetched and mirrored below. Both writers
+    # store the coin_a_id < coin_b_id orientation of every pair.
+    correlations = db.execute(
+        select(
+            AnalyticsCorrelation.coin_a_id,
+            AnalyticsCorrelation.coin_b_id,
+            AnalyticsCorrelation.correlation,
+            AnalyticsCorrelation.computed_at,
+        ).where(
+            AnalyticsCorrelation.period_days == period_days,
+            AnalyticsCorrelation.coin_a_id.in_(coin_ids),
+            AnalyticsCorrelation.coin_b_id.in_(coin_ids),
+            AnalyticsCorrelation.coin_a_id < AnalyticsCorrelation.coin_b_id,
+        )
+    ).all() if coin_ids else []
 
-    # Build NxN matrix
+    # Build the NxN matrix in one float64 array: scatter both triangles at
+    # once, NaN marks missing pairs and becomes None on the way out
     n = len(coin_ids)
-    matrix = [[None] * n for _ in range(n)]
-    computed_at = None
     coin_idx = {cid: idx for idx, cid in enumerate(coin_ids)}
+    matrix_arr = np.full((n, n), np.nan)
+    if correlations:
+        a = np.fromiter((coin_idx[c.coin_a_id] for c in correlations), dtype=np.intp, count=len(correlations))
+        b = np.fromiter((coin_idx[c.coin_b_id] for c in correlations), dtype=np.intp, count=len(correlations))
+        v = np.array([c.correlation for c in correlations], dtype=np.float64)
+        matrix_arr[a, b] = v
+        matrix_arr[b, a] = v
+    np.fill_diagonal(matrix_arr, 1.0)
+    matrix = [[None if x != x else x for x in row] for row in matrix_arr.tolist()]
 
-    for corr in correlations:
-        if corr.coin_a_id in coin_idx and corr.coin_b_id in coin_idx:
-            i = coin_idx[corr.coin_a_id]
-            j = coin_idx[corr.coin_b_id]
-            if i >= 0 and j >= 0:
-                val = float(corr.correlation) if corr.correlation is not None else None
-                matrix[i][j] = val
-                matrix[j][i] = val
-                if corr.computed_at:
-                    computed_at = corr.computed_at
-
-    # Diagonal = 1.0
-    for i in range(n):
-        matrix[i][i] = 1.0
+    computed_at = max((c.computed_at for c in correlations if c.computed_at), default=None)
 
     return {
         "coins": symbols,
@@ -55,32 +61,20 @@ def get_correlation_matrix(db: Session, period_days: int = 30, top_n: int = 15)
 
 def get_volatility_ranking(db: Session, period_days: int = 30) -> list[dict]:
     """Return coins ranked by volatility."""
-    coins = {c.id: c for c in db.query(DimCoin).all()}
-
-    entries = (
-        db.query(AnalyticsVolatility)
-        .filter(AnalyticsVolatility.period_days == period_days)
-        .order_by(AnalyticsVolatility.volatility.desc())
-        .all()
-    )
-
-    latest_rows = db.execute(text("SELECT coin_id, market_cap FROM mv_latest_market_data")).fetchall()
-    market_caps = {r.coin_id: float(r.market_cap) if r.market_cap else None for r in latest_rows}
-
-    result = []
-    for e in entries:
-        coin = coins.get(e.coin_id)
-        if coin:
-            result.append({
-                "coin_id": e.coin_id,
-                "symbol": coin.symbol,
-                "name": coin.name,
-                "volatility": float(e.volatility) if e.volatility else 0,
-                "max_drawdown": float(e.max_drawdown) if e.max_drawdown else None,
-                "sharpe_ratio": float(e.sharpe_ratio) if e.sharpe_ratio else None,
-                "period_days": e.period_days,
-                "market_cap": market_caps.get(e.coin_id),
-                "image_url": coin.image_url,
-            })
+    # Casts and null handling happen in Postgres (0 volatility for missing
+    # values, None for zero drawdown/Sharpe), so rows map straight to dicts
+    rows = db.execute(text("""
+        SELECT
+            v.coin_id, c.symbol, c.name,
+            COALESCE(v.volatility, 0)::float8 AS volatility,
+            NULLIF(v.max_drawdown, 0)::float8 AS max_drawdown,
+            NULLIF(v.sharpe_ratio, 0)::float8 AS sharpe_ratio,
+            v.period_days, m.market_cap, c.image_url
+        FROM analytics_volatility v
+        JOIN dim_coin c ON c.id = v.coin_id
+        LEFT JOIN mv_latest_market_data m ON m.coin_id = v.coin_id
+        WHERE v.period_days = :period_days
+        ORDER BY v.volatility DESC
+    """), {"period_days": period_days}).mappings().all()
 
-    return result
+    return [dict(r) for r in rows]
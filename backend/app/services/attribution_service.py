@@ -1,10 +1,10 @@
 from collections import defaultdict
 
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.models.coin import DimCoin
 from app.models.portfolio import PortfolioHolding
+from app.services.market_service import get_latest_market_data
 
 
 def compute_attribution(db: Session, user_id: int) -> dict:
@@ -27,14 +27,10 @@ def compute_attribution(db: Session, user_id: int) -> dict:
 
     coin_ids = list({h.coin_id for h in holdings})
 
-    # Fetch current prices from materialized view
-    prices: dict[int, float | None] = {}
-    rows = db.execute(
-        text("SELECT coin_id, price_usd FROM mv_latest_market_data WHERE coin_id = ANY(:ids)"),
-        {"ids": coin_ids},
-    ).fetchall()
-    for r in rows:
-        prices[r.coin_id] = float(r.price_usd) if r.price_usd is not None else None
+    # Fetch current prices from the latest market snapshot
+    prices: dict[int, float | None] = {
+        cid: row["price_usd"] for cid, row in get_latest_market_data(db, coin_ids).items()
+    }
 
     # Fetch coin info (symbol, name, image_url, category)
     coins: dict[int, DimCoin] = {}
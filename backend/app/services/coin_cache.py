@@ -0,0 +1,96 @@
+"""In-process cache of coin identity fields.
+
+Alert and realtime endpoints echo the coin's symbol/name back in their
+responses. dim_coin rows only change when ingestion upserts them, so a bounded
+per-process LRU with a short TTL answers those lookups without a query. Write
+endpoints still check existence against the DB (``fresh=True``) so a deleted
+coin is a 404 rather than a foreign-key error.
+Ingestion runs in separate processes and cannot invalidate this cache, so the
+TTL bounds how stale a renamed coin or new image URL can be.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.coin import DimCoin
+
+_COIN_CACHE_TTL = 600  # seconds
+_COIN_CACHE_MAX = 4096
+
+_lock = threading.Lock()
+_cache: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+
+
+def get_coin_info(db: Session, coin_id: int, *, fresh: bool = False) -> dict | None:
+    """Return ``{id, coingecko_id, symbol, name, image_url}`` for a coin, or None.
+
+    Only hits are cached, so a coin ingested after a failed lookup is found
+    on the next request. ``fresh=True`` skips the cached entry and reloads it
+    from the DB; write paths use it to validate that the coin still exists.
+    """
+    now = time.monotonic()
+    if not fresh:
+        with _lock:
+            entry = _cache.get(coin_id)
+            if entry is not None and entry[0] > now:
+                _cache.move_to_end(coin_id)
+                return entry[1]
+
+    row = db.execute(
+        select(DimCoin.id, DimCoin.coingecko_id, DimCoin.symbol, DimCoin.name, DimCoin.image_url)
+        .where(DimCoin.id == coin_id)
+    ).mappings().first()
+
+    with _lock:
+        if row is None:
+            _cache.pop(coin_id, None)
+            return None
+        info = dict(row)
+        _cache[coin_id] = (now + _COIN_CACHE_TTL, info)
+        _cache.move_to_end(coin_id)
+        if len(_cache) > _COIN_CACHE_MAX:
+            _cache.popitem(last=False)
+    return info
+
+
+def get_coin_infos(db: Session, coin_ids) -> dict[int, dict]:
+    """Batch form of :func:`get_coin_info`: ``{coin_id: info}`` for the coins that exist.
+
+    Cached coins are served from memory; the rest are loaded in one query.
+    """
+    now = time.monotonic()
+    found: dict[int, dict] = {}
+    missing: list[int] = []
+    with _lock:
+        for cid in set(coin_ids):
+            entry = _cache.get(cid)
+            if entry is not None and entry[0] > now:
+                _cache.move_to_end(cid)
+                found[cid] = entry[1]
+            else:
+                missing.append(cid)
+
+    if missing:
+        rows = db.execute(
+            select(DimCoin.id, DimCoin.coingecko_id, DimCoin.symbol, DimCoin.name, DimCoin.image_url)
+            .where(DimCoin.id.in_(missing))
+        ).mappings().all()
+        with _lock:
+            for row in rows:
+                info = dict(row)
+                found[info["id"]] = info
+                _cache[info["id"]] = (now + _COIN_CACHE_TTL, info)
+                _cache.move_to_end(info["id"])
+            while len(_cache) > _COIN_CACHE_MAX:
+                _cache.popitem(last=False)
+    return found
+
+
+def clear_coin_cache() -> None:
+    """Drop all cached coins (for testing)."""
+    with _lock:
+        _cache.clear()
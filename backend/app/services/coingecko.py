@@ -1,22 +1,57 @@
+import threading
 import time
 import httpx
 from app.config import settings
 
 
+class TokenBucket:
+    """Thread-safe token bucket: ``capacity`` requests per minute, refilled continuously."""
+
+    def __init__(self, capacity: int):
+        self.capacity = float(capacity)
+        self.refill_per_sec = capacity / 60.0
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self) -> float:
+        """Take one token; return 0.0, or the seconds to wait before it is available.
+
+        A caller that gets a wait still owns its token (the balance goes
+        negative), so waiters are served in arrival order without retrying.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.refill_per_sec)
+            self._last = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.refill_per_sec
+
+
 class CoinGeckoClient:
     """Rate-limited CoinGecko API client with retry logic."""
 
     def __init__(self):
         self.base_url = settings.COINGECKO_BASE_URL
         self.rate_limit = settings.COINGECKO_RATE_LIMIT
-        self._last_request_time = 0.0
-        self._min_interval = 60.0 / self.rate_limit
+        self._bucket = TokenBucket(self.rate_limit)
+        # One pooled client for the process: keep-alive connections reuse the
+        # TLS session instead of a handshake per request
+        self._client = httpx.Client(
+            timeout=30,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        )
 
     def _wait_for_rate_limit(self):
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self._min_interval:
-            time.sleep(self._min_interval - elapsed)
-        self._last_request_time = time.time()
+        # Sleep outside the bucket's lock so other callers can take tokens meanwhile
+        pause = self._bucket.consume()
+        if pause > 0:
+            time.sleep(pause)
+
+    def close(self):
+        self._client.close()
 
     def _request(self, endpoint: str, params: dict | None = None, retries: int = 3) -> dict | list:
         self._wait_for_rate_limit()
@@ -24,15 +59,14 @@ class CoinGeckoClient:
         last_response = None
         for attempt in range(retries):
             try:
-                with httpx.Client(timeout=30) as client:
-                    resp = client.get(url, params=params)
-                    if resp.status_code == 429:
-                        last_response = resp
-                        wait = 2 ** (attempt + 1) * 10
-                        time.sleep(wait)
-                        continue
-                    resp.raise_for_status()
-                    return resp.json()
+                resp = self._client.get(url, params=params)
+                if resp.status_code == 429:
+                    last_response = resp
+                    wait = 2 ** (attempt + 1) * 10
+                    time.sleep(wait)
+                    continue
+                resp.raise_for_status()
+                return resp.json()
             except (httpx.HTTPError, httpx.TimeoutException):
                 if attempt == retries - 1:
                     raise
@@ -4,13 +4,69 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.models.coin import DimCoin
+from app.utils.cache import cache_enabled, cache_hash_get, cache_hash_set
+
+# mv_latest_market_data is refreshed every ingestion run (~10 min); a short-lived
+# Redis snapshot of it replaces a Postgres round-trip on every detail/portfolio read.
+# The ingestion jobs delete this key (pipelines/plugins/api_cache.py) right after
+# each refresh; the TTL only bounds staleness if that delete is missed.
+_LATEST_CACHE_KEY = "mv:latest"
+_LATEST_CACHE_TTL = 60
+
+
+def get_latest_market_data(db: Session, coin_ids: list[int]) -> dict[int, dict]:
+    """Return the latest market snapshot for each of ``coin_ids`` that has one.
+
+    Served from a Redis hash of the whole materialized view; on a miss the view
+    is read once and the hash repopulated. When Redis is unavailable only the
+    requested rows are read.
+    """
+    if not coin_ids:
+        return {}
+
+    if not cache_enabled():
+        # Without Redis there is nothing to repopulate; read only the requested rows
+        rows = db.execute(text("""
+            SELECT coin_id, price_usd, market_cap, total_volume, price_change_24h_pct, circulating_supply
+            FROM mv_latest_market_data
+            WHERE coin_id = ANY(:ids)
+        """), {"ids": list(coin_ids)}).mappings().all()
+        return {row["coin_id"]: dict(row) for row in rows}
+
+    cached = cache_hash_get(_LATEST_CACHE_KEY, coin_ids)
+    if cached is not None:
+        return {cid: row for cid, row in zip(coin_ids, cached) if row is not None}
+
+    rows = db.execute(text("""
+        SELECT coin_id, price_usd, market_cap, total_volume, price_change_24h_pct, circulating_supply
+        FROM mv_latest_market_data
+    """)).mappings().all()
+    snapshot = {row["coin_id"]: dict(row) for row in rows}
+    cache_hash_set(_LATEST_CACHE_KEY, snapshot, ttl=_LATEST_CACHE_TTL)
+    return {cid: snapshot[cid] for cid in coin_ids if cid in snapshot}
 
 
 def get_market_overview(db: Session) -> dict:
     """Get total market cap, volume, BTC dominance, top movers."""
-    latest = db.execute(text("SELECT * FROM mv_latest_market_data")).fetchall()
+    # Totals, BTC's cap and the data timestamp in one aggregate over the view,
+    # rather than pulling every row into Python to sum it
+    totals = db.execute(text("""
+        SELECT
+            COUNT(*) AS active_coins,
+            COALESCE(SUM(m.market_cap), 0) AS total_market_cap,
+            COALESCE(SUM(m.total_volume), 0) AS total_volume,
+            (
+                SELECT b.market_cap
+                FROM mv_latest_market_data b
+                JOIN dim_coin c ON c.id = b.coin_id
+                WHERE c.symbol = 'btc'
+                LIMIT 1
+            ) AS btc_cap,
+            (SELECT MAX(timestamp) FROM fact_market_data) AS last_updated
+        FROM mv_latest_market_data m
+    """)).fetchone()
 
-    if not latest:
+    if not totals.active_coins:
         return {
             "total_market_cap": 0,
             "total_volume_24h": 0,
@@ -23,8 +79,8 @@ def get_market_overview(db: Session) -> dict:
             "last_updated": None,
         }
 
-    total_market_cap = sum(float(r.market_cap or 0) for r in latest)
-    total_volume = sum(float(r.total_volume or 0) for r in latest)
+    total_market_cap = totals.total_market_cap
+    total_volume = totals.total_volume
 
     # Get aggregate values from ~24h ago for delta calculation
     prev_row = db.execute(text("""
@@ -52,50 +108,43 @@ def get_market_overview(db: Session) -> dict:
     if prev_volume and prev_volume > 0:
         volume_change_pct = round((total_volume - prev_volume) / prev_volume * 100, 2)
 
-    # Build coin map only for IDs present in latest data
-    coin_ids = [r.coin_id for r in latest]
-    coins = {c.id: c for c in db.query(DimCoin).filter(DimCoin.id.in_(coin_ids)).all()} if coin_ids else {}
-
-    # BTC dominance (using already-fetched coins)
-    btc_cap = 0
-    for r in latest:
-        coin = coins.get(r.coin_id)
-        if coin and coin.symbol == "btc":
-            btc_cap = float(r.market_cap or 0)
-            break
+    btc_cap = totals.btc_cap or 0
     btc_dominance = (btc_cap / total_market_cap * 100) if total_market_cap > 0 else 0
 
-    movers = []
-    for r in latest:
-        coin = coins.get(r.coin_id)
-        if coin and r.price_change_24h_pct is not None:
-            movers.append({
-                "id": coin.id,
-                "symbol": coin.symbol,
-                "name": coin.name,
-                "image_url": coin.image_url,
-                "price_usd": float(r.price_usd or 0),
-                "price_change_24h_pct": float(r.price_change_24h_pct),
-            })
-
-    movers.sort(key=lambda x: x["price_change_24h_pct"], reverse=True)
-
-    # Get the most recent data timestamp
-    last_updated_row = db.execute(text(
-        "SELECT MAX(timestamp) AS last_updated FROM fact_market_data"
-    )).fetchone()
-    last_updated = last_updated_row.last_updated.isoformat() if last_updated_row and last_updated_row.last_updated else None
+    # Top and bottom five movers ranked in the database; only ten rows come back
+    mover_rows = db.execute(text("""
+        WITH movers AS (
+            SELECT
+                c.id, c.symbol, c.name, c.image_url,
+                COALESCE(m.price_usd, 0) AS price_usd,
+                m.price_change_24h_pct
+            FROM mv_latest_market_data m
+            JOIN dim_coin c ON c.id = m.coin_id
+            WHERE m.price_change_24h_pct IS NOT NULL
+        )
+        (SELECT TRUE AS gainer, * FROM movers ORDER BY price_change_24h_pct DESC LIMIT 5)
+        UNION ALL
+        (SELECT FALSE AS gainer, * FROM movers ORDER BY price_change_24h_pct ASC LIMIT 5)
+    """)).mappings().all()
+
+    top_gainers, top_losers = [], []
+    for row in mover_rows:
+        mover = dict(row)
+        (top_gainers if mover.pop("gainer") else top_losers).append(mover)
+    # UNION ALL does not promise to keep each branch's order
+    top_gainers.sort(key=lambda x: x["price_change_24h_pct"], reverse=True)
+    top_losers.sort(key=lambda x: x["price_change_24h_pct"])
 
     return {
         "total_market_cap": total_market_cap,
         "total_volume_24h": total_volume,
         "btc_dominance": round(btc_dominance, 2),
-        "active_coins": len(latest),
-        "top_gainers": movers[:5],
-        "top_losers": movers[-5:][::-1],
+        "active_coins": totals.active_coins,
+        "top_gainers": top_gainers,
+        "top_losers": top_losers,
         "market_cap_change_24h_pct": market_cap_change_pct,
         "volume_change_24h_pct": volume_change_pct,
-        "last_updated": last_updated,
+        "last_updated": totals.last_updated.isoformat() if totals.last_updated else None,
     }
 
 
@@ -1,6 +1,6 @@
 import httpx
-import json
 import logging
+import orjson
 
 from app.config import settings
 
@@ -33,7 +33,7 @@ async def get_fear_greed_index() -> dict:
         try:
             cached = r.get(_CACHE_KEY)
             if cached:
-                return json.loads(cached)
+                return orjson.loads(cached)
         except Exception:
             logger.debug("Redis cache read failed for %s", _CACHE_KEY)
 
@@ -65,7 +65,7 @@ async def get_fear_greed_index() -> dict:
                 cached = r.get(_CACHE_KEY)
                 if cached:
                     logger.info("Returning cached sentiment data after API failure")
-                    return json.loads(cached)
+                    return orjson.loads(cached)
             except Exception:
                 pass
         raise
@@ -73,7 +73,7 @@ async def get_fear_greed_index() -> dict:
     # Cache the result
     if r is not None:
         try:
-            r.setex(_CACHE_KEY, _CACHE_TTL, json.dumps(result))
+            r.setex(_CACHE_KEY, _CACHE_TTL, orjson.dumps(result))
         except Exception:
             logger.debug("Redis cache write failed for %s", _CACHE_KEY)
 
@@ -0,0 +1,123 @@
+"""Shared Redis response cache for read-heavy endpoints.
+
+Follows the same strategy as the rate limiter: a lazily-initialized shared
+client, and every operation degrades to a cache miss when Redis is
+unavailable so endpoints keep working without it.
+"""
+
+import logging
+from typing import Any
+
+import orjson
+
+from app.config import settings
+
+_logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "cache:"
+
+# Shared Redis client (lazy-initialized)
+_redis_client = None
+
+
+def _get_redis():
+    global _redis_client
+    if _redis_client is None:
+        try:
+            import redis
+            _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+            _redis_client.ping()
+        except Exception:
+            _redis_client = False
+            _logger.info("Redis unavailable for response caching, caching disabled")
+    return _redis_client if _redis_client is not False else None
+
+
+def cache_enabled() -> bool:
+    """True when Redis is reachable, so a cached copy is worth building."""
+    return _get_redis() is not None
+
+
+def cache_get(key: str) -> Any | None:
+    """Return the cached value for ``key``, or None on a miss."""
+    r = _get_redis()
+    if r is None:
+        return None
+    try:
+        raw = r.get(_KEY_PREFIX + key)
+    except Exception:
+        _logger.debug("Redis cache read failed for %s", key)
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+def cache_set(key: str, value: Any, ttl: int) -> None:
+    """Store a JSON-serializable ``value`` under ``key`` for ``ttl`` seconds."""
+    r = _get_redis()
+    if r is None:
+        return
+    try:
+        r.setex(_KEY_PREFIX + key, ttl, orjson.dumps(value))
+    except Exception:
+        _logger.debug("Redis cache write failed for %s", key)
+
+
+def cache_hash_get(key: str, fields: list) -> list | None:
+    """Return the cached values of ``fields`` in hash ``key``.
+
+    Returns None when the hash itself is not cached; fields absent from a
+    cached hash come back as None.
+    """
+    r = _get_redis()
+    if r is None:
+        return None
+    full_key = _KEY_PREFIX + key
+    try:
+        pipe = r.pipeline(transaction=False)
+        pipe.exists(full_key)
+        pipe.hmget(full_key, fields)
+        exists, raw = pipe.execute()
+    except Exception:
+        _logger.debug("Redis cache read failed for %s", key)
+        return None
+    if not exists:
+        return None
+    return [orjson.loads(v) if v is not None else None for v in raw]
+
+
+def cache_hash_set(key: str, mapping: dict, ttl: int) -> None:
+    """Atomically replace hash ``key`` with ``mapping`` for ``ttl`` seconds."""
+    r = _get_redis()
+    if r is None or not mapping:
+        return
+    full_key = _KEY_PREFIX + key
+    try:
+        pipe = r.pipeline()
+        pipe.delete(full_key)
+        pipe.hset(full_key, mapping={k: orjson.dumps(v) for k, v in mapping.items()})
+        pipe.expire(full_key, ttl)
+        pipe.execute()
+    except Exception:
+        _logger.debug("Redis cache write failed for %s", key)
+
+
+def cache_delete(key: str) -> None:
+    """Drop ``key`` so the next read repopulates it."""
+    r = _get_redis()
+    if r is None:
+        return
+    try:
+        r.delete(_KEY_PREFIX + key)
+    except Exception:
+        _logger.debug("Redis cache delete failed for %s", key)
+
+
+def clear_all():
+    """Clear all cached responses (for testing)."""
+    r = _get_redis()
+    if r:
+        try:
+            for key in r.scan_iter(f"{_KEY_PREFIX}*"):
+                r.delete(key)
+        except Exception:
+            pass
@@ -0,0 +1,87 @@
+"""Keyset pagination: opaque cursors and the shared page query.
+
+A cursor encodes the sort key of the last row on a page, ``(timestamp, id)``,
+so the next page is fetched with a ``(ts, id) < (:ts, :id)`` range scan instead
+of an OFFSET that walks every skipped row.
+"""
+
+import base64
+import binascii
+import math
+from datetime import datetime
+from typing import NamedTuple
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+from app.utils.cache import cache_get, cache_set
+
+
+def encode_cursor(ts: datetime, row_id: int) -> str:
+    """Encode the sort key of the last row on a page."""
+    return base64.urlsafe_b64encode(orjson.dumps([ts.isoformat(), row_id])).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor, or raise 400."""
+    try:
+        ts, row_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(ts), int(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+class KeysetPage(NamedTuple):
+    """One page of rows plus the pagination fields of a PaginatedResponse."""
+    rows: list
+    total: int
+    page: int | None
+    pages: int | None
+    next_cursor: str | None
+
+
+def paginate_keyset(
+    query: Query,
+    ts_col,
+    id_col,
+    *,
+    page: int,
+    per_page: int,
+    cursor: str | None,
+    count_key: str,
+    count_ttl: int,
+) -> KeysetPage:
+    """Fetch one page of ``query`` ordered by ``(ts_col, id_col)`` descending.
+
+    With a cursor the page is a keyset range scan and ``page``/``pages`` are
+    None; otherwise it falls back to OFFSET paging by ``page``.
+    """
+    # Reject a malformed cursor before spending a COUNT on the request
+    keyset = decode_cursor(cursor) if cursor else None
+
+    # Cursor requests page through a changing table, so an approximate
+    # (briefly cached) total is good enough and avoids a COUNT per page
+    total = cache_get(count_key) if keyset else None
+    if total is None:
+        total = query.count()
+        if keyset:
+            cache_set(count_key, total, ttl=count_ttl)
+
+    if keyset:
+        query = query.filter(tuple_(ts_col, id_col) < keyset)
+        page = pages = None
+    else:
+        query = query.offset((page - 1) * per_page)
+        pages = math.ceil(total / per_page) if total > 0 else 1
+
+    rows = query.order_by(ts_col.desc(), id_col.desc()).limit(per_page).all()
+
+    last_ts = getattr(rows[-1], ts_col.key) if rows else None
+    next_cursor = (
+        encode_cursor(last_ts, getattr(rows[-1], id_col.key))
+        if len(rows) == per_page and last_ts
+        else None
+    )
+    return KeysetPage(rows, total, page, pages, next_cursor)
@@ -1,17 +1,28 @@
+import asyncio
 import logging
 import time
 
+import orjson
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps(message: dict | str) -> str:
+    """Encode a message as a JSON text frame; pre-encoded strings pass through."""
+    if isinstance(message, str):
+        return message
+    return orjson.dumps(message).decode()
+
+
 class ConnectionManager:
     """Manages WebSocket connections for real-time price broadcasting."""
 
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
-        self.user_connections: dict[int, list[WebSocket]] = {}
+        # Sets (plus a reverse user map) keep connect/disconnect O(1) under churn
+        self.active_connections: set[WebSocket] = set()
+        self.user_connections: dict[int, set[WebSocket]] = {}
+        self._connection_users: dict[WebSocket, int] = {}
         self._last_broadcast_time: float | None = None
         self._message_count: int = 0
         self._recent_broadcasts: list[float] = []
@@ -49,51 +60,49 @@ class ConnectionManager:
 
     async def connect(self, websocket: WebSocket, user_id: int | None = None):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         if user_id is not None:
-            self.user_connections.setdefault(user_id, []).append(websocket)
+            self.user_connections.setdefault(user_id, set()).add(websocket)
+            self._connection_users[websocket] = user_id
 
     def disconnect(self, websocket: WebSocket):
-        try:
-            self.active_connections.remove(websocket)
-        except ValueError:
-            pass
+        self.active_connections.discard(websocket)
         # Clean up user_connections
-        for uid, conns in list(self.user_connections.items()):
-            if websocket in conns:
-                conns.remove(websocket)
+        uid = self._connection_users.pop(websocket, None)
+        if uid is not None:
+            conns = self.user_connections.get(uid)
+            if conns is not None:
+                conns.discard(websocket)
                 if not conns:
                     del self.user_connections[uid]
-                break
 
-    async def send_to_user(self, user_id: int, message: dict):
+    @staticmethod
+    async def _fan_out(connections: list[WebSocket], payload: str) -> list[WebSocket]:
+        """Send ``payload`` to all ``connections`` concurrently; return the ones that failed."""
+        results = await asyncio.gather(
+            *(conn.send_text(payload) for conn in connections),
+            return_exceptions=True,
+        )
+        return [conn for conn, result in zip(connections, results) if isinstance(result, Exception)]
+
+    async def send_to_user(self, user_id: int, message: dict | str):
         """Send a message to all connections for a specific user."""
-        conns = self.user_connections.get(user_id, [])
-        disconnected = []
-        for conn in list(conns):
-            try:
-                await conn.send_json(message)
-            except Exception:
-                disconnected.append(conn)
-        for conn in disconnected:
+        conns = list(self.user_connections.get(user_id, []))
+        if not conns:
+            return
+        for conn in await self._fan_out(conns, _dumps(message)):
             self.disconnect(conn)
 
-    async def broadcast(self, message: dict):
+    async def broadcast(self, message: dict | str):
         now = time.time()
         self._last_broadcast_time = now
         self._message_count += 1
         self._recent_broadcasts.append(now)
-        disconnected = []
-        for connection in list(self.active_connections):
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.append(connection)
+        # Serialize once; every client receives the same frame, and one slow
+        # client no longer delays the sends to the others
+        disconnected = await self._fan_out(list(self.active_connections), _dumps(message))
         for conn in disconnected:
-            try:
-                self.active_connections.remove(conn)
-            except ValueError:
-                pass
+            self.disconnect(conn)
 
 
 manager = ConnectionManager()
@@ -1,17 +1,135 @@
+import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 
-from app.database import Base, get_db
-from app.main import app
+from app.config import settings
+
+# Under pytest-xdist (`pytest -n auto`) every worker runs against its own
+# database cloned from <db>_test_base and its own Redis DB, so MV refreshes,
+# clean-slate deletes, cache clears and rate-limit counters in one worker never
+# block or leak into another. Settings are rewritten before app.database
+# builds its engine.
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+# Redis DB 0 is the app's and a default server has 16, so one each for gw0-gw14
+_MAX_XDIST_WORKERS = 15
+
+
+def _admin_engine(url):
+    """AUTOCOMMIT engine on the server's maintenance DB, for CREATE/DROP DATABASE."""
+    return create_engine(
+        url.set(drivername="postgresql+psycopg", database="postgres"),
+        isolation_level="AUTOCOMMIT",
+    )
+
+
+def _template_db_name(url) -> str:
+    return f"{url.database}_test_base"
+
+
+def _redis_url_with_db(redis_url: str, db: int) -> str:
+    """Point a redis://, rediss:// or unix:// URL at another logical DB."""
+    parts = urlsplit(redis_url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "db"]
+    if parts.scheme == "unix":
+        # The path is the socket; the DB index lives in the query string.
+        # Built by hand because urlunsplit drops the empty authority ("//")
+        query.append(("db", str(db)))
+        return f"unix://{parts.netloc}{parts.path}?{urlencode(query)}"
+    return urlunsplit(parts._replace(path=f"/{db}", query=urlencode(query)))
+
+
+def _is_xdist_controller(config) -> bool:
+    return not hasattr(config, "workerinput") and bool(config.getoption("numprocesses", default=None))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    # `-n auto` on a 16+ core machine would otherwise run out of Redis DBs
+    return min(os.cpu_count() or 1, _MAX_XDIST_WORKERS)
+
+
+def pytest_configure(config):
+    # Controller process only: snapshot the main database once into the
+    # template each worker clones (cloning needs the source to be idle)
+    if not _is_xdist_controller(config):
+        return
+    if config.getoption("numprocesses") > _MAX_XDIST_WORKERS:
+        raise pytest.UsageError(
+            f"at most {_MAX_XDIST_WORKERS} xdist workers are supported: "
+            "each needs its own Redis DB (1-15)"
+        )
+    url = make_url(settings.DATABASE_URL)
+    template = _template_db_name(url)
+    admin = _admin_engine(url)
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{template}" WITH (FORCE)'))
+        conn.execute(text(f'CREATE DATABASE "{template}" TEMPLATE "{url.database}"'))
+    admin.dispose()
+
+
+def pytest_unconfigure(config):
+    # Workers have dropped their clones by now; drop the template they shared
+    if not _is_xdist_controller(config):
+        return
+    url = make_url(settings.DATABASE_URL)
+    admin = _admin_engine(url)
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{_template_db_name(url)}" WITH (FORCE)'))
+    admin.dispose()
+
+
+if _XDIST_WORKER:
+    _main_url = make_url(settings.DATABASE_URL)
+    _worker_db = f"{_main_url.database}_test_{_XDIST_WORKER}"
+    _admin = _admin_engine(_main_url)
+    with _admin.connect() as _conn:
+        _conn.execute(text(f'DROP DATABASE IF EXISTS "{_worker_db}" WITH (FORCE)'))
+        _conn.execute(text(
+            f'CREATE DATABASE "{_worker_db}" TEMPLATE "{_template_db_name(_main_url)}"'
+        ))
+    _admin.dispose()
+    settings.DATABASE_URL = _main_url.set(database=_worker_db).render_as_string(hide_password=False)
+    # Redis DB 0 is the app's; gwN takes DB N+1 (N < _MAX_XDIST_WORKERS)
+    settings.REDIS_URL = _redis_url_with_db(settings.REDIS_URL, 1 + int(_XDIST_WORKER.removeprefix("gw")))
+
+# Production argon2id parameters cost ~64 MiB and tens of ms per hash; tests
+# only need hashes that round-trip. Set before app.auth.jwt builds its hasher.
+settings.PASSWORD_HASH_TIME_COST = 1
+settings.PASSWORD_HASH_MEMORY_COST = 1024
+
+from app.database import Base, DATABASE_URL, get_db, engine as _app_engine  # noqa: E402
+from app.main import app  # noqa: E402
 
 # Use the same database but in a transaction that gets rolled back
-from app.config import settings
-TEST_DB_URL = settings.DATABASE_URL
+TEST_DB_URL = DATABASE_URL
 
 engine = create_engine(TEST_DB_URL)
-TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+# Session commits/rollbacks inside a test act on a SAVEPOINT, so the outer
+# per-test transaction stays open until the db fixture rolls it back
+TestingSessionLocal = sessionmaker(
+    bind=engine, autocommit=False, autoflush=False,
+    join_transaction_mode="create_savepoint",
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _drop_worker_database():
+    """Drop this xdist worker's cloned database once its tests are done."""
+    yield
+    if not _XDIST_WORKER:
+        return
+    # Release pooled connections first; DROP ... WITH (FORCE) would cut them anyway
+    engine.dispose()
+    _app_engine.dispose()
+    admin = _admin_engine(_main_url)
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{_worker_db}" WITH (FORCE)'))
+    admin.dispose()
 
 
 @pytest.fixture
@@ -25,8 +143,15 @@ def db():
     connection.close()
 
 
+@pytest.fixture(scope="session")
+def _app_client():
+    """One TestClient for the session, so the app lifespan runs once."""
+    with TestClient(app) as c:
+        yield c
+
+
 @pytest.fixture
-def client(db):
+def client(db, _app_client):
     def override_get_db():
         yield db
 
@@ -35,7 +160,52 @@ def client(db):
     # Clear login rate limiter state before each test (in-memory + Redis)
     from app.routers.auth import _clear_rate_limits
     _clear_rate_limits()
+    # Cached responses may reflect rows from another test's rolled-back transaction
+    from app.utils.cache import clear_all as _clear_cache
+    _clear_cache()
+    from app.services.coin_cache import clear_coin_cache
+    clear_coin_cache()
 
-    with TestClient(app) as c:
-        yield c
+    yield _app_client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def auth_token(db):
+    """Factory: create a user inside the test transaction and return a signed token for it.
+
+    Skips the register/login round-trips and their password hashing; tests that
+    exercise the auth endpoints themselves still go through HTTP.
+    """
+    from app.auth.jwt import create_access_token
+    from app.models.user import User
+
+    def _make(email: str = "user@example.com") -> str:
+        user = User(email=email, hashed_password="!", full_name="Test User")
+        db.add(user)
+        db.flush()
+        return create_access_token(data={"sub": str(user.id)})
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def _seed_coin_ids():
+    """IDs of the first two seeded coins, read once per session."""
+    with engine.connect() as conn:
+        return [row[0] for row in conn.execute(text("SELECT id FROM dim_coin ORDER BY id LIMIT 2"))]
+
+
+@pytest.fixture
+def coin_id(_seed_coin_ids):
+    if not _seed_coin_ids:
+        pytest.skip("No coins in dim_coin")
+    return _seed_coin_ids[0]
+
+
+@pytest.fixture
+def coin_ids(_seed_coin_ids):
+    if len(_seed_coin_ids) < 2:
+        pytest.skip("Need at least 2 coins in dim_coin")
+    return _seed_coin_ids[0], _seed_coin_ids[1]
+
@@ -1,29 +1,7 @@
-import pytest
-from sqlalchemy import text
-
-
-def _register_and_get_token(client, email="alerts@example.com"):
-    """Register a user and return their auth token."""
-    client.post("/api/v1/auth/register", json={
-        "email": email, "password": "pass1234", "full_name": "Alert User",
-    })
-    resp = client.post("/api/v1/auth/login", json={
-        "email": email, "password": "pass1234",
-    })
-    return resp.json()["access_token"]
-
-
 def _auth_header(token):
     return {"Authorization": f"Bearer {token}"}
 
 
-def _get_coin(db):
-    coin = db.execute(text("SELECT id FROM dim_coin LIMIT 1")).fetchone()
-    if not coin:
-        pytest.skip("No coins in dim_coin")
-    return coin[0]
-
-
 # --- Auth gating ---
 
 def test_alerts_requires_auth(client):
@@ -45,9 +23,8 @@ def test_alerts_requires_auth(client):
 
 # --- CRUD ---
 
-def test_create_alert(client, db):
-    token = _register_and_get_token(client, "create-alert@example.com")
-    coin_id = _get_coin(db)
+def test_create_alert(client, auth_token, coin_id):
+    token = auth_token("create-alert@example.com")
 
     resp = client.post("/api/v1/alerts", json={
         "coin_id": coin_id, "target_price": 50000.0, "direction": "above",
@@ -63,9 +40,8 @@ def test_create_alert(client, db):
     assert "name" in data
 
 
-def test_create_alert_invalid_direction(client, db):
-    token = _register_and_get_token(client, "bad-dir@example.com")
-    coin_id = _get_coin(db)
+def test_create_alert_invalid_direction(client, auth_token, coin_id):
+    token = auth_token("bad-dir@example.com")
 
     resp = client.post("/api/v1/alerts", json={
         "coin_id": coin_id, "target_price": 100.0, "direction": "sideways",
@@ -73,9 +49,8 @@ def test_create_alert_invalid_direction(client, db):
     assert resp.status_code == 422
 
 
-def test_create_alert_negative_price(client, db):
-    token = _register_and_get_token(client, "neg-price@example.com")
-    coin_id = _get_coin(db)
+def test_create_alert_negative_price(client, auth_token, coin_id):
+    token = auth_token("neg-price@example.com")
 
     resp = client.post("/api/v1/alerts", json={
         "coin_id": coin_id, "target_price": -10.0, "direction": "above",
@@ -83,9 +58,8 @@ def test_create_alert_negative_price(client, db):
     assert resp.status_code == 422
 
 
-def test_create_alert_zero_price(client, db):
-    token = _register_and_get_token(client, "zero-price@example.com")
-    coin_id = _get_coin(db)
+def test_create_alert_zero_price(client, auth_token, coin_id):
+    token = auth_token("zero-price@example.com")
 
     resp = client.post("/api/v1/alerts", json={
         "coin_id": coin_id, "target_price": 0, "direction": "below",
@@ -93,10 +67,9 @@ def test_create_alert_zero_price(client, db):
     assert resp.status_code == 422
 
 
-def test_create_multiple_alerts_same_direction(client, db):
+def test_create_multiple_alerts_same_direction(client, auth_token, coin_id):
     """Creating multiple alerts for the same coin/direction should create separate alerts."""
-    token = _register_and_get_token(client, "dup-alert@example.com")
-    coin_id = _get_coin(db)
+    token = auth_token("dup-alert@example.com")
 
     resp1 = client.post("/api/v1/alerts", json={
         "coin_id": coin_id, "target_price": 50000.0, "direction": "above",
@@ -114,9 +87,8 @@ def test_create_multiple_alerts_same_direction(client, db):
     assert resp2.json()["target_price"] == 60000.0
 
 
-def test_get_alerts(client, db):
-    token = _register_and_get_token(client, "get-alerts@example.com")
-    coin_id = _get_coin(db)
+def test_get_alerts(client, auth_token, coin_id):
+    token = auth_token("get-alerts@example.com")
 
     # Create an alert
     client.post("/api/v1/alerts", json={
@@ -131,9 +103,8 @@ def test_get_alerts(client, db):
     assert alerts[0]["direction"] == "below"
 
 
-def test_delete_alert(client, db):
-    token = _register_and_get_token(client, "del-alert@example.com")
-    coin_id = _get_coin(db)
+def test_delete_alert(client, auth_token, coin_id):
+    token = auth_token("del-alert@example.com")
 
     resp = client.post("/api/v1/alerts", json={
         "coin_id": coin_id, "target_price": 100.0, "direction": "above",
@@ -148,11 +119,10 @@ def test_delete_alert(client, db):
     assert all(a["id"] != alert_id for a in resp.json())
 
 
-def test_delete_other_users_alert(client, db):
+def test_delete_other_users_alert(client, auth_token, coin_id):
     """A user cannot delete another user's alert."""
-    token_a = _register_and_get_token(client, "alert-owner-a@example.com")
-    token_b = _register_and_get_token(client, "alert-owner-b@example.com")
-    coin_id = _get_coin(db)
+    token_a = auth_token("alert-owner-a@example.com")
+    token_b = auth_token("alert-owner-b@example.com")
 
     resp = client.post("/api/v1/alerts", json={
         "coin_id": coin_id, "target_price": 100.0, "direction": "above",
@@ -164,24 +134,24 @@ def test_delete_other_users_alert(client, db):
     assert resp.status_code == 404
 
 
-def test_delete_nonexistent_alert(client):
-    token = _register_and_get_token(client, "del-404@example.com")
+def test_delete_nonexistent_alert(client, auth_token):
+    token = auth_token("del-404@example.com")
     resp = client.delete("/api/v1/alerts/99999", headers=_auth_header(token))
     assert resp.status_code == 404
 
 
-def test_create_alert_nonexistent_coin(client):
-    token = _register_and_get_token(client, "no-coin@example.com")
+def test_create_alert_nonexistent_coin(client, auth_token):
+    token = auth_token("no-coin@example.com")
     resp = client.post("/api/v1/alerts", json={
         "coin_id": 99999, "target_price": 100.0, "direction": "above",
     }, headers=_auth_header(token))
     assert resp.status_code == 404
 
 
-def test_check_alerts_scoped_to_user(client, db):
+def test_check_alerts_scoped_to_user(client, db, auth_token):
     """check_alerts should only return the current user's triggered alerts."""
-    token_a = _register_and_get_token(client, "check-a@example.com")
-    token_b = _register_and_get_token(client, "check-b@example.com")
+    token_a = auth_token("check-a@example.com")
+    token_b = auth_token("check-b@example.com")
 
     # Both users create alerts — check endpoint only returns own
     resp_a = client.post("/api/v1/alerts/check", headers=_auth_header(token_a))
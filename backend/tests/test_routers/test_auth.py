@@ -407,3 +407,39 @@ def test_forgot_password_production_no_dev_token(client):
     data = resp.json()
     assert "message" in data
     assert "dev_token" not in data
+
+
+def test_login_upgrades_legacy_bcrypt_hash(client, db):
+    """A user with a legacy bcrypt hash can log in and is rehashed to argon2id."""
+    import bcrypt
+    from app.models.user import User
+
+    legacy_hash = bcrypt.hashpw(b"pass1234", bcrypt.gensalt(rounds=4)).decode("utf-8")
+    db.add(User(email="legacy-bcrypt@example.com", hashed_password=legacy_hash))
+    db.flush()
+
+    resp = client.post("/api/v1/auth/login", json={
+        "email": "legacy-bcrypt@example.com", "password": "pass1234",
+    })
+    assert resp.status_code == 200
+
+    user = db.query(User).filter(User.email == "legacy-bcrypt@example.com").first()
+    assert user.hashed_password.startswith("$argon2id$")
+
+
+def test_cached_token_rejected_after_expiry(client):
+    """A token verified earlier must still be rejected once it has expired."""
+    import time
+    from unittest.mock import patch
+    from app.auth.jwt import decode_access_token
+
+    client.post("/api/v1/auth/register", json={
+        "email": "cached-token@example.com", "password": "pass1234",
+    })
+    token = client.post("/api/v1/auth/login", json={
+        "email": "cached-token@example.com", "password": "pass1234",
+    }).json()["access_token"]
+
+    assert decode_access_token(token) is not None
+    with patch("app.auth.jwt.time.time", return_value=time.time() + 2 * 24 * 3600):
+        assert decode_access_token(token) is None
@@ -23,6 +23,18 @@ def test_list_coins_search(client):
         assert "bitcoin" in item["name"].lower() or "btc" in item["symbol"].lower()
 
 
+def test_list_coins_blank_search_ignored(client):
+    blank = client.get("/api/v1/coins?search=%20%20").json()
+    unfiltered = client.get("/api/v1/coins").json()
+    assert blank["total"] == unfiltered["total"]
+
+
+def test_list_coins_search_escapes_wildcards(client):
+    resp = client.get("/api/v1/coins?search=%25")
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 0
+
+
 def test_get_coin_not_found(client):
     resp = client.get("/api/v1/coins/99999")
     assert resp.status_code == 404
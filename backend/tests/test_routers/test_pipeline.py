@@ -27,6 +27,43 @@ def test_pipeline_runs_filter_by_dag_id(client):
     assert data["items"] == []
 
 
+def test_pipeline_runs_keyset_cursor(client, db):
+    from sqlalchemy import text
+
+    for i in range(3):
+        db.execute(text("""
+            INSERT INTO pipeline_runs (dag_id, status, records_processed, created_at)
+            VALUES ('cursor_test_dag', 'success', 0, NOW() - make_interval(mins => :i))
+        """), {"i": i})
+    db.flush()
+
+    first = client.get("/api/v1/pipeline/runs?dag_id=cursor_test_dag&per_page=2").json()
+    assert len(first["items"]) == 2
+    assert first["next_cursor"]
+
+    second = client.get(
+        f"/api/v1/pipeline/runs?dag_id=cursor_test_dag&per_page=2&cursor={first['next_cursor']}"
+    ).json()
+    assert len(second["items"]) == 1
+    assert second["next_cursor"] is None
+    # Page numbers don't apply to a cursor page
+    assert second["page"] is None
+    assert second["pages"] is None
+    seen = {item["id"] for item in first["items"]}
+    assert second["items"][0]["id"] not in seen
+
+
+def test_pipeline_runs_invalid_cursor(client):
+    from unittest.mock import patch
+
+    with patch("sqlalchemy.orm.Query.count") as count, patch("app.utils.pagination.cache_set") as cache_set:
+        resp = client.get("/api/v1/pipeline/runs?cursor=not-a-cursor")
+    assert resp.status_code == 400
+    # Rejected before the COUNT and its cache write
+    count.assert_not_called()
+    cache_set.assert_not_called()
+
+
 def test_pipeline_health_response_shape(client):
     resp = client.get("/api/v1/pipeline/health")
     assert resp.status_code == 200
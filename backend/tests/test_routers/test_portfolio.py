@@ -2,59 +2,25 @@ import pytest
 from sqlalchemy import text
 
 
-def _register_and_get_token(client, email="portfolio@example.com"):
-    """Register a user and return their auth token."""
-    client.post("/api/v1/auth/register", json={
-        "email": email, "password": "pass1234", "full_name": "Portfolio User",
-    })
-    resp = client.post("/api/v1/auth/login", json={
-        "email": email, "password": "pass1234",
-    })
-    return resp.json()["access_token"]
-
-
 def _auth_header(token):
     return {"Authorization": f"Bearer {token}"}
 
 
-def _get_coin(db):
-    coin = db.execute(text("SELECT id FROM dim_coin LIMIT 1")).fetchone()
-    if not coin:
-        pytest.skip("No coins in dim_coin")
-    return coin[0]
-
-
-def _get_two_coins(db):
-    coins = db.execute(text("SELECT id FROM dim_coin LIMIT 2")).fetchall()
-    if len(coins) < 2:
-        pytest.skip("Need at least 2 coins in dim_coin")
-    return coins[0][0], coins[1][0]
-
-
-def test_portfolio_requires_auth(client):
-    resp = client.get("/api/v1/portfolio")
-    assert resp.status_code in (401, 403)
-
-    resp = client.get("/api/v1/portfolio/holdings")
-    assert resp.status_code in (401, 403)
-
-    resp = client.post("/api/v1/portfolio/holdings", json={
-        "coin_id": 1, "quantity": 1.0, "buy_price_usd": 100.0,
-    })
-    assert resp.status_code in (401, 403)
-
-    resp = client.put("/api/v1/portfolio/holdings/1", json={"quantity": 2.0})
-    assert resp.status_code in (401, 403)
-
-    resp = client.delete("/api/v1/portfolio/holdings/1")
-    assert resp.status_code in (401, 403)
-
-    resp = client.get("/api/v1/portfolio/performance")
+@pytest.mark.parametrize("method,path,body", [
+    ("GET", "/api/v1/portfolio", None),
+    ("GET", "/api/v1/portfolio/holdings", None),
+    ("POST", "/api/v1/portfolio/holdings", {"coin_id": 1, "quantity": 1.0, "buy_price_usd": 100.0}),
+    ("PUT", "/api/v1/portfolio/holdings/1", {"quantity": 2.0}),
+    ("DELETE", "/api/v1/portfolio/holdings/1", None),
+    ("GET", "/api/v1/portfolio/performance", None),
+])
+def test_portfolio_requires_auth(client, method, path, body):
+    resp = client.request(method, path, json=body)
     assert resp.status_code in (401, 403)
 
 
-def test_get_empty_portfolio_summary(client):
-    token = _register_and_get_token(client, "empty-summary@example.com")
+def test_get_empty_portfolio_summary(client, auth_token):
+    token = auth_token("empty-summary@example.com")
     resp = client.get("/api/v1/portfolio", headers=_auth_header(token))
     assert resp.status_code == 200
     data = resp.json()
@@ -64,16 +30,15 @@ def test_get_empty_portfolio_summary(client):
     assert data["unique_coins"] == 0
 
 
-def test_get_empty_holdings_list(client):
-    token = _register_and_get_token(client, "empty-holdings@example.com")
+def test_get_empty_holdings_list(client, auth_token):
+    token = auth_token("empty-holdings@example.com")
     resp = client.get("/api/v1/portfolio/holdings", headers=_auth_header(token))
     assert resp.status_code == 200
     assert resp.json() == []
 
 
-def test_add_holding(client, db):
-    token = _register_and_get_token(client, "add-holding@example.com")
-    coin_id = _get_coin(db)
+def test_add_holding(client, auth_token, coin_id):
+    token = auth_token("add-holding@example.com")
 
     resp = client.post("/api/v1/portfolio/holdings", json={
         "coin_id": coin_id, "quantity": 1.5, "buy_price_usd": 50000.0,
@@ -96,8 +61,8 @@ def test_add_holding(client, db):
     assert holdings[0]["coin_id"] == coin_id
 
 
-def test_add_holding_invalid_coin(client):
-    token = _register_and_get_token(client, "invalid-coin@example.com")
+def test_add_holding_invalid_coin(client, auth_token):
+    token = auth_token("invalid-coin@example.com")
     resp = client.post("/api/v1/portfolio/holdings", json={
         "coin_id": 99999, "quantity": 1.0, "buy_price_usd": 100.0,
     }, headers=_auth_header(token))
@@ -105,18 +70,16 @@ def test_add_holding_invalid_coin(client):
     assert resp.json()["detail"] == "Coin not found"
 
 
-def test_add_holding_zero_quantity(client, db):
-    token = _register_and_get_token(client, "zero-qty@example.com")
-    coin_id = _get_coin(db)
+def test_add_holding_zero_quantity(client, auth_token, coin_id):
+    token = auth_token("zero-qty@example.com")
     resp = client.post("/api/v1/portfolio/holdings", json={
         "coin_id": coin_id, "quantity": 0, "buy_price_usd": 100.0,
     }, headers=_auth_header(token))
     assert resp.status_code == 422
 
 
-def test_add_holding_with_notes(client, db):
-    token = _register_and_get_token(client, "notes@example.com")
-    coin_id = _get_coin(db)
+def test_add_holding_with_notes(client, auth_token, coin_id):
+    token = auth_token("notes@example.com")
     resp = client.post("/api/v1/portfolio/holdings", json={
         "coin_id": coin_id, "quantity": 2.0, "buy_price_usd": 100.0,
         "notes": "DCA purchase #1",
@@ -125,9 +88,8 @@ def test_add_holding_with_notes(client, db):
     assert resp.json()["notes"] == "DCA purchase #1"
 
 
-def test_multiple_holdings_same_coin(client, db):
-    token = _register_and_get_token(client, "multi-lot@example.com")
-    coin_id = _get_coin(db)
+def test_multiple_holdings_same_coin(client, auth_token, coin_id):
+    token = auth_token("multi-lot@example.com")
 
     # Add two lots of the same coin
     client.post("/api/v1/portfolio/holdings", json={
@@ -151,9 +113,8 @@ def test_multiple_holdings_same_coin(client, db):
     assert summary["total_cost_basis_usd"] == expected_cost
 
 
-def test_update_holding(client, db):
-    token = _register_and_get_token(client, "update@example.com")
-    coin_id = _get_coin(db)
+def test_update_holding(client, auth_token, coin_id):
+    token = auth_token("update@example.com")
 
     resp = client.post("/api/v1/portfolio/holdings", json={
         "coin_id": coin_id, "quantity": 1.0, "buy_price_usd": 100.0,
@@ -173,18 +134,17 @@ def test_update_holding(client, db):
     assert resp.json()[0]["quantity"] == 2.5
 
 
-def test_update_holding_not_found(client):
-    token = _register_and_get_token(client, "update-404@example.com")
+def test_update_holding_not_found(client, auth_token):
+    token = auth_token("update-404@example.com")
     resp = client.put("/api/v1/portfolio/holdings/99999", json={
         "quantity": 2.0,
     }, headers=_auth_header(token))
     assert resp.status_code == 404
 
 
-def test_update_holding_other_user(client, db):
-    token_a = _register_and_get_token(client, "owner-a@example.com")
-    token_b = _register_and_get_token(client, "owner-b@example.com")
-    coin_id = _get_coin(db)
+def test_update_holding_other_user(client, auth_token, coin_id):
+    token_a = auth_token("owner-a@example.com")
+    token_b = auth_token("owner-b@example.com")
 
     resp = client.post("/api/v1/portfolio/holdings", json={
         "coin_id": coin_id, "quantity": 1.0, "buy_price_usd": 100.0,
@@ -198,9 +158,8 @@ def test_update_holding_other_user(client, db):
     assert resp.status_code == 404
 
 
-def test_delete_holding(client, db):
-    token = _register_and_get_token(client, "delete@example.com")
-    coin_id = _get_coin(db)
+def test_delete_holding(client, auth_token, coin_id):
+    token = auth_token("delete@example.com")
 
     resp = client.post("/api/v1/portfolio/holdings", json={
         "coin_id": coin_id, "quantity": 1.0, "buy_price_usd": 100.0,
@@ -215,16 +174,15 @@ def test_delete_holding(client, db):
     assert resp.json() == []
 
 
-def test_delete_holding_not_found(client):
-    token = _register_and_get_token(client, "delete-404@example.com")
+def test_delete_holding_not_found(client, auth_token):
+    token = auth_token("delete-404@example.com")
     resp = client.delete("/api/v1/portfolio/holdings/99999", headers=_auth_header(token))
     assert resp.status_code == 404
 
 
-def test_delete_holding_other_user(client, db):
-    token_a = _register_and_get_token(client, "del-owner-a@example.com")
-    token_b = _register_and_get_token(client, "del-owner-b@example.com")
-    coin_id = _get_coin(db)
+def test_delete_holding_other_user(client, auth_token, coin_id):
+    token_a = auth_token("del-owner-a@example.com")
+    token_b = auth_token("del-owner-b@example.com")
 
     resp = client.post("/api/v1/portfolio/holdings", json={
         "coin_id": coin_id, "quantity": 1.0, "buy_price_usd": 100.0,
@@ -236,9 +194,9 @@ def test_delete_holding_other_user(client, db):
     assert resp.status_code == 404
 
 
-def test_portfolio_summary_with_holdings(client, db):
-    token = _register_and_get_token(client, "summary@example.com")
-    coin_a, coin_b = _get_two_coins(db)
+def test_portfolio_summary_with_holdings(client, auth_token, coin_ids):
+    token = auth_token("summary@example.com")
+    coin_a, coin_b = coin_ids
 
     client.post("/api/v1/portfolio/holdings", json={
         "coin_id": coin_a, "quantity": 2.0, "buy_price_usd": 100.0,
@@ -255,8 +213,8 @@ def test_portfolio_summary_with_holdings(client, db):
     assert summary["total_cost_basis_usd"] == 2.0 * 100.0 + 3.0 * 50.0
 
 
-def test_portfolio_performance_empty(client):
-    token = _register_and_get_token(client, "perf-empty@example.com")
+def test_portfolio_performance_empty(client, auth_token):
+    token = auth_token("perf-empty@example.com")
     resp = client.get("/api/v1/portfolio/performance?days=30", headers=_auth_header(token))
     assert resp.status_code == 200
     data = resp.json()
@@ -278,9 +236,9 @@ def _insert_orphan_coin(db):
     return row[0]
 
 
-def test_portfolio_summary_no_prices(client, db):
+def test_portfolio_summary_no_prices(client, db, auth_token):
     """Summary returns correctly when a holding's coin has no entry in mv_latest_market_data."""
-    token = _register_and_get_token(client, "no-prices@example.com")
+    token = auth_token("no-prices@example.com")
     coin_id = _insert_orphan_coin(db)
 
     # Add a holding for this price-less coin
@@ -305,9 +263,9 @@ def test_portfolio_summary_no_prices(client, db):
     assert summary["total_pnl_pct"] is None
 
 
-def test_portfolio_performance_empty_range(client, db):
+def test_portfolio_performance_empty_range(client, db, auth_token):
     """Performance returns empty data_points when no price data exists for the holding's coin."""
-    token = _register_and_get_token(client, "perf-empty-range@example.com")
+    token = auth_token("perf-empty-range@example.com")
     coin_id = _insert_orphan_coin(db)
 
     # Add a holding for a coin with no historical price data
@@ -1,35 +1,24 @@
 import pytest
+from sqlalchemy import text
 
-
-def _register_and_get_token(client, email="watchlist@example.com"):
-    """Register a user and return their auth token."""
-    client.post("/api/v1/auth/register", json={
-        "email": email, "password": "pass1234", "full_name": "WL User",
-    })
-    resp = client.post("/api/v1/auth/login", json={
-        "email": email, "password": "pass1234",
-    })
-    return resp.json()["access_token"]
+from app.auth.jwt import decode_access_token
+from app.services.coin_cache import get_coin_info
+from app.utils.cache import cache_get, cache_set
 
 
 def _auth_header(token):
     return {"Authorization": f"Bearer {token}"}
 
 
-def test_get_empty_watchlist(client):
-    token = _register_and_get_token(client)
+def test_get_empty_watchlist(client, auth_token):
+    token = auth_token()
     resp = client.get("/api/v1/watchlist", headers=_auth_header(token))
     assert resp.status_code == 200
     assert resp.json()["coin_ids"] == []
 
 
-def test_add_to_watchlist(client, db):
-    token = _register_and_get_token(client)
-    # Use coin_id=1 (Bitcoin should exist in dim_coin)
-    coin = db.execute(__import__("sqlalchemy").text("SELECT id FROM dim_coin LIMIT 1")).fetchone()
-    if not coin:
-        pytest.skip("No coins in dim_coin")
-    coin_id = coin[0]
+def test_add_to_watchlist(client, auth_token, coin_id):
+    token = auth_token()
 
     resp = client.post(f"/api/v1/watchlist/{coin_id}", headers=_auth_header(token))
     assert resp.status_code == 201
@@ -40,12 +29,37 @@ def test_add_to_watchlist(client, db):
     assert coin_id in resp.json()["coin_ids"]
 
 
-def test_add_duplicate_idempotent(client, db):
-    token = _register_and_get_token(client)
-    coin = db.execute(__import__("sqlalchemy").text("SELECT id FROM dim_coin LIMIT 1")).fetchone()
-    if not coin:
-        pytest.skip("No coins in dim_coin")
-    coin_id = coin[0]
+def test_watchlist_cache_follows_add_get_remove(client, auth_token, coin_id):
+    token = auth_token()
+
+    # Prime the cached (empty) watchlist, then make sure each write is visible
+    assert client.get("/api/v1/watchlist", headers=_auth_header(token)).json()["coin_ids"] == []
+    client.post(f"/api/v1/watchlist/{coin_id}", headers=_auth_header(token))
+    assert client.get("/api/v1/watchlist", headers=_auth_header(token)).json()["coin_ids"] == [coin_id]
+    # Read again so the post-add list is the cached one when the remove lands
+    assert client.get("/api/v1/watchlist", headers=_auth_header(token)).json()["coin_ids"] == [coin_id]
+    client.delete(f"/api/v1/watchlist/{coin_id}", headers=_auth_header(token))
+    assert client.get("/api/v1/watchlist", headers=_auth_header(token)).json()["coin_ids"] == []
+
+
+def test_watchlist_write_replaces_stale_cached_list(client, auth_token, coin_id):
+    """A list cached by a read that raced the write is overwritten, not kept."""
+    token = auth_token()
+    user_id = int(decode_access_token(token)["sub"])
+
+    # As if a concurrent GET stored pre-write rows after the previous write
+    cache_set(f"watchlist:{user_id}", [], ttl=60)
+    client.post(f"/api/v1/watchlist/{coin_id}", headers=_auth_header(token))
+    assert cache_get(f"watchlist:{user_id}") in (None, [coin_id])  # None without Redis
+    assert client.get("/api/v1/watchlist", headers=_auth_header(token)).json()["coin_ids"] == [coin_id]
+
+    cache_set(f"watchlist:{user_id}", [coin_id], ttl=60)
+    client.delete(f"/api/v1/watchlist/{coin_id}", headers=_auth_header(token))
+    assert client.get("/api/v1/watchlist", headers=_auth_header(token)).json()["coin_ids"] == []
+
+
+def test_add_duplicate_idempotent(client, auth_token, coin_id):
+    token = auth_token()
 
     client.post(f"/api/v1/watchlist/{coin_id}", headers=_auth_header(token))
     resp = client.post(f"/api/v1/watchlist/{coin_id}", headers=_auth_header(token))
@@ -58,12 +72,8 @@ def test_add_duplicate_idempotent(client, db):
     assert resp.json()["coin_ids"].count(coin_id) == 1
 
 
-def test_remove_from_watchlist(client, db):
-    token = _register_and_get_token(client)
-    coin = db.execute(__import__("sqlalchemy").text("SELECT id FROM dim_coin LIMIT 1")).fetchone()
-    if not coin:
-        pytest.skip("No coins in dim_coin")
-    coin_id = coin[0]
+def test_remove_from_watchlist(client, auth_token, coin_id):
+    token = auth_token()
 
     client.post(f"/api/v1/watchlist/{coin_id}", headers=_auth_header(token))
     resp = client.delete(f"/api/v1/watchlist/{coin_id}", headers=_auth_header(token))
@@ -74,25 +84,38 @@ def test_remove_from_watchlist(client, db):
     assert coin_id not in resp.json()["coin_ids"]
 
 
-def test_remove_nonexistent(client):
-    token = _register_and_get_token(client)
+def test_remove_nonexistent(client, auth_token):
+    token = auth_token()
     resp = client.delete("/api/v1/watchlist/99999", headers=_auth_header(token))
     assert resp.status_code == 404
 
 
-def test_add_invalid_coin(client):
-    token = _register_and_get_token(client)
+def test_add_invalid_coin(client, auth_token):
+    token = auth_token()
     resp = client.post("/api/v1/watchlist/99999", headers=_auth_header(token))
     assert resp.status_code == 404
     assert resp.json()["detail"] == "Coin not found"
 
 
-def test_watchlist_requires_auth(client):
-    resp = client.get("/api/v1/watchlist")
-    assert resp.status_code in (401, 403)
+def test_add_deleted_coin_still_cached(client, auth_token, db):
+    """A coin removed after it was cached is a 404, not a foreign-key error."""
+    token = auth_token()
+    db.execute(text(
+        "INSERT INTO dim_coin (id, coingecko_id, symbol, name) VALUES (990001, 'gone-coin', 'gone', 'Gone')"
+    ))
+    assert get_coin_info(db, 990001) is not None
+    db.execute(text("DELETE FROM dim_coin WHERE id = 990001"))
+
+    resp = client.post("/api/v1/watchlist/990001", headers=_auth_header(token))
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "Coin not found"
 
-    resp = client.post("/api/v1/watchlist/1")
-    assert resp.status_code in (401, 403)
 
-    resp = client.delete("/api/v1/watchlist/1")
+@pytest.mark.parametrize("method,path", [
+    ("GET", "/api/v1/watchlist"),
+    ("POST", "/api/v1/watchlist/1"),
+    ("DELETE", "/api/v1/watchlist/1"),
+])
+def test_watchlist_requires_auth(client, method, path):
+    resp = client.request(method, path)
     assert resp.status_code in (401, 403)
@@ -0,0 +1,40 @@
+"""Tests for app.services.coin_cache (in-process coin identity cache)."""
+
+from unittest.mock import MagicMock
+
+from sqlalchemy import text
+
+from app.services.coin_cache import clear_coin_cache, get_coin_info
+
+
+def _insert_coin(db, coin_id):
+    db.execute(text("""
+        INSERT INTO dim_coin (id, coingecko_id, symbol, name, created_at, updated_at)
+        VALUES (:id, 'cache-test-coin', 'ctc', 'Cache Test Coin', NOW(), NOW())
+        ON CONFLICT (id) DO NOTHING
+    """), {"id": coin_id})
+    db.flush()
+
+
+def test_get_coin_info_hit_is_served_from_cache(db):
+    clear_coin_cache()
+    _insert_coin(db, 990001)
+
+    info = get_coin_info(db, 990001)
+    assert info["symbol"] == "ctc"
+    assert info["name"] == "Cache Test Coin"
+
+    # A second lookup must not touch the session at all
+    untouched = MagicMock()
+    assert get_coin_info(untouched, 990001) == info
+    untouched.execute.assert_not_called()
+    clear_coin_cache()
+
+
+def test_get_coin_info_miss_is_not_cached(db):
+    clear_coin_cache()
+    assert get_coin_info(db, 990002) is None
+
+    _insert_coin(db, 990002)
+    assert get_coin_info(db, 990002)["id"] == 990002
+    clear_coin_cache()
@@ -1,11 +1,12 @@
-"""Tests for app.services.market_service (get_market_overview, get_kpi_sparklines)."""
+"""Tests for app.services.market_service (get_latest_market_data, get_market_overview, get_kpi_sparklines)."""
 
 from datetime import datetime, timezone, timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
 from sqlalchemy import text
 
-from app.services.market_service import get_market_overview, get_kpi_sparklines
+from app.services.market_service import get_latest_market_data, get_market_overview, get_kpi_sparklines
 
 
 # ---------------------------------------------------------------------------
@@ -286,3 +287,17 @@ class TestGetKpiSparklines:
 
         # BTC dominance should be 100% since it's the only coin
         assert all(pytest.approx(v, abs=0.1) == 100.0 for v in result["btc_dominance"])
+
+
+def test_latest_market_data_without_redis_reads_only_requested_ids():
+    """With Redis down there is no snapshot to rebuild, so the view is filtered by id."""
+    db = MagicMock()
+    db.execute.return_value.mappings.return_value.all.return_value = [
+        {"coin_id": 7, "price_usd": 1.5},
+    ]
+    with patch("app.utils.cache._get_redis", return_value=None):
+        assert get_latest_market_data(db, [7]) == {7: {"coin_id": 7, "price_usd": 1.5}}
+
+    stmt, params = db.execute.call_args.args
+    assert "ANY(:ids)" in str(stmt)
+    assert params == {"ids": [7]}
@@ -2,6 +2,9 @@ import pytest
 
 from app.websocket.manager import ConnectionManager
 
+# Pure in-process tests: no db/client fixtures, selectable with `pytest -m unit`
+pytestmark = pytest.mark.unit
+
 
 @pytest.fixture
 def mgr():
@@ -33,3 +36,25 @@ async def test_manager_broadcast_updates_stats(mgr):
 
     await mgr.broadcast({"type": "test2"})
     assert mgr.message_count == 2
+
+
+def test_coalesce_merges_price_updates():
+    """Buffered price updates collapse into one message; latest price wins."""
+    from app.main import _coalesce_messages
+
+    merged = _coalesce_messages([
+        {"type": "price_update", "prices": {"bitcoin": 1.0, "ethereum": 2.0}},
+        {"type": "price_update", "prices": {"bitcoin": 3.0}},
+    ])
+    assert merged == [{"type": "price_update", "prices": {"bitcoin": 3.0, "ethereum": 2.0}}]
+
+
+def test_coalesce_passes_through_other_messages():
+    """Non price_update payloads are broadcast unchanged."""
+    from app.main import _coalesce_messages
+
+    other = {"type": "heartbeat"}
+    merged = _coalesce_messages([other, {"type": "price_update", "prices": {"bitcoin": 1.0}}])
+    assert merged[0] == other
+    assert merged[1]["prices"] == {"bitcoin": 1.0}
+    assert _coalesce_messages([]) == []
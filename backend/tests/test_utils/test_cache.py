@@ -0,0 +1,106 @@
+"""Tests for app.utils.cache (Redis response cache helpers)."""
+
+import importlib.util
+from pathlib import Path
+from unittest.mock import patch
+
+from app.routers import pipeline
+from app.services import market_service
+from app.utils import cache
+
+_API_CACHE_PATH = Path(__file__).resolve().parents[3] / "pipelines" / "plugins" / "api_cache.py"
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    # Hash commands, with pipelines executing eagerly
+    def exists(self, key):
+        return int(key in self.store)
+
+    def hmget(self, key, fields):
+        h = self.store.get(key, {})
+        return [h.get(str(f)) for f in fields]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def hset(self, key, mapping):
+        self.store.setdefault(key, {}).update({str(k): v for k, v in mapping.items()})
+
+    def expire(self, key, ttl):
+        pass
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._results = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self._results.append(getattr(self._redis, name)(*args, **kwargs))
+        return call
+
+    def execute(self):
+        return self._results
+
+
+def test_cache_roundtrip():
+    fake = _FakeRedis()
+    with patch("app.utils.cache._get_redis", return_value=fake):
+        assert cache.cache_get("coins:count:") is None
+        cache.cache_set("coins:count:", 42, ttl=60)
+        assert cache.cache_get("coins:count:") == 42
+    assert "cache:coins:count:" in fake.store
+
+
+def test_cache_without_redis_is_a_miss():
+    with patch("app.utils.cache._get_redis", return_value=None):
+        cache.cache_set("key", {"a": 1}, ttl=60)
+        assert cache.cache_get("key") is None
+
+
+def test_cache_hash_roundtrip():
+    fake = _FakeRedis()
+    with patch("app.utils.cache._get_redis", return_value=fake):
+        assert cache.cache_hash_get("mv:latest", [1, 2]) is None
+        cache.cache_hash_set("mv:latest", {1: {"price_usd": 10.5}}, ttl=60)
+        # Cached hash: present fields decode, absent ones are None (not a miss)
+        assert cache.cache_hash_get("mv:latest", [1, 2]) == [{"price_usd": 10.5}, None]
+
+
+def _load_pipeline_api_cache():
+    """Import the pipelines' invalidation helper, which lives outside the backend package."""
+    spec = importlib.util.spec_from_file_location("api_cache", _API_CACHE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_pipeline_invalidation_deletes_the_keys_the_api_writes():
+    api_cache = _load_pipeline_api_cache()
+    assert api_cache.KEY_PREFIX == cache._KEY_PREFIX
+    assert api_cache.LATEST_SNAPSHOT_KEY == market_service._LATEST_CACHE_KEY
+    assert api_cache.PIPELINE_HEALTH_KEY == pipeline._HEALTH_CACHE_KEY
+
+    fake = _FakeRedis()
+    with patch("app.utils.cache._get_redis", return_value=fake):
+        cache.cache_hash_set(market_service._LATEST_CACHE_KEY, {1: {"price_usd": 1.0}}, ttl=60)
+        cache.cache_set(pipeline._HEALTH_CACHE_KEY, [], ttl=20)
+    assert len(fake.store) == 2
+
+    with patch("redis.Redis.from_url", return_value=fake):
+        api_cache.invalidate_cache(api_cache.LATEST_SNAPSHOT_KEY, api_cache.PIPELINE_HEALTH_KEY)
+    assert fake.store == {}
@@ -1,14 +1,16 @@
 """pgAdmin4 local configuration for CryptoFlow."""
 
-import os
+from pathlib import Path
 
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
-DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
-STORAGE_DIR = os.path.join(DATA_DIR, "storage")
-SESSION_DB_PATH = os.path.join(DATA_DIR, "sessions")
-SQLITE_PATH = os.path.join(DATA_DIR, "pgadmin4.db")
+# pgAdmin expects plain strings; absolute() (not resolve()) keeps symlinks as-is
+_DATA = Path(__file__).absolute().parent / "data"
+DATA_DIR = str(_DATA)
+STORAGE_DIR = str(_DATA / "storage")
+SESSION_DB_PATH = str(_DATA / "sessions")
+SQLITE_PATH = str(_DATA / "pgadmin4.db")
 LOG_FILE = "/tmp/cryptoflow-pgadmin.log"
 
 # ---------------------------------------------------------------------------
@@ -10,6 +10,9 @@ Checks
 2. **completeness**       – Does the latest snapshot contain all coins?
 3. **null_check**         – Are there any NULL prices in the last 100 rows?
 4. **anomaly_detection**  – Any price change > 50 % within a 10-minute window?
+
+Checks 1-3 each need a single scalar and run together in ``check_snapshot``;
+anomaly detection runs as its own task.
 """
 
 from __future__ import annotations
@@ -50,133 +53,109 @@ def _insert_check(cur, check_name: str, table_name: str, status: str, details: s
 # Individual check callables
 # ---------------------------------------------------------------------------
 
-def check_freshness(**context):
-    """
-    PASS if the most recent row in fact_market_data is less than 30 minutes old.
-    FAIL otherwise.
-    """
-    conn = _get_conn()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT MAX(timestamp) FROM fact_market_data"
-            )
-            row = cur.fetchone()
-            max_ts = row[0] if row else None
-
-            if max_ts is None:
-                status = "failed"
-                details = "No data in fact_market_data"
-            else:
-                # Ensure max_ts is tz-aware
-                if max_ts.tzinfo is None:
-                    max_ts = max_ts.replace(tzinfo=timezone.utc)
-                age = datetime.now(timezone.utc) - max_ts
-                age_minutes = age.total_seconds() / 60.0
-                if age_minutes <= 30:
-                    status = "passed"
-                    details = f"Latest data is {age_minutes:.1f} minutes old"
-                else:
-                    status = "failed"
-                    details = f"Latest data is {age_minutes:.1f} minutes old (threshold: 30 min)"
-
-            logger.info("Freshness check: %s – %s", status, details)
-            _insert_check(cur, "freshness", "fact_market_data", status, details)
-        conn.commit()
-    finally:
-        conn.close()
-
-    context["ti"].xcom_push(key="freshness_status", value=status)
-
-
-def check_completeness(**context):
+def _freshness_result(max_ts: datetime | None) -> tuple[str, str]:
+    """PASS if the most recent row is less than 30 minutes old, FAIL otherwise."""
+    if max_ts is None:
+        return "failed", "No data in fact_market_data"
+    # Ensure max_ts is tz-aware
+    if max_ts.tzinfo is None:
+        max_ts = max_ts.replace(tzinfo=timezone.utc)
+    age = datetime.now(timezone.utc) - max_ts
+    age_minutes = age.total_seconds() / 60.0
+    if age_minutes <= 30:
+        return "passed", f"Latest data is {age_minutes:.1f} minutes old"
+    return "failed", f"Latest data is {age_minutes:.1f} minutes old (threshold: 30 min)"
+
+
+def _completeness_result(total_coins: int, recent_coins: int) -> tuple[str, str]:
     """
     PASS if the latest snapshot (within 15 min window) contains all coins that
     exist in dim_coin.  WARNING if some are missing.
     """
-    conn = _get_conn()
-    try:
-        with conn.cursor() as cur:
-            # Total coins known
-            cur.execute("SELECT COUNT(*) FROM dim_coin")
-            total_coins = cur.fetchone()[0]
-
-            # Distinct coins in the last 15 minutes
-            cur.execute(
-                """
-                SELECT COUNT(DISTINCT coin_id)
-                FROM fact_market_data
-                WHERE timestamp >= NOW() - INTERVAL '15 minutes'
-                """
-            )
-            recent_coins = cur.fetchone()[0]
-
-            if total_coins == 0:
-                status = "warning"
-                details = "dim_coin is empty"
-            elif recent_coins >= total_coins:
-                status = "passed"
-                details = f"All {total_coins} coins present in latest snapshot"
-            else:
-                missing = total_coins - recent_coins
-                status = "warning"
-                details = (
-                    f"Only {recent_coins}/{total_coins} coins in latest snapshot "
-                    f"({missing} missing)"
-                )
+    if total_coins == 0:
+        return "warning", "dim_coin is empty"
+    if recent_coins >= total_coins:
+        return "passed", f"All {total_coins} coins present in latest snapshot"
+    missing = total_coins - recent_coins
+    return "warning", (
+        f"Only {recent_coins}/{total_coins} coins in latest snapshot "
+        f"({missing} missing)"
+    )
 
-            logger.info("Completeness check: %s – %s", status, details)
-            _insert_check(cur, "completeness", "fact_market_data", status, details)
-        conn.commit()
-    finally:
-        conn.close()
 
-    context["ti"].xcom_push(key="completeness_status", value=status)
+def _null_result(null_count: int) -> tuple[str, str]:
+    """PASS if there are zero NULL price_usd values in the last 100 rows, FAIL otherwise."""
+    if null_count == 0:
+        return "passed", "No NULL prices in the last 100 rows"
+    return "failed", f"Found {null_count} NULL price_usd values in the last 100 rows"
 
 
-def check_nulls(**context):
+def check_snapshot(**context):
     """
-    PASS if there are zero NULL price_usd values in the last 100 rows.
-    FAIL otherwise.
+    Run the freshness, completeness and null checks.  Each only needs one
+    scalar, so all four scalars come back from a single query and the three
+    results are written in one INSERT.
     """
     conn = _get_conn()
     try:
         with conn.cursor() as cur:
             cur.execute(
                 """
-                SELECT COUNT(*) AS null_count
-                FROM (
-                    SELECT price_usd
-                    FROM fact_market_data
-                    ORDER BY timestamp DESC
-                    LIMIT 100
-                ) recent
-                WHERE recent.price_usd IS NULL
+                SELECT
+                    (SELECT MAX(timestamp) FROM fact_market_data) AS max_ts,
+                    (SELECT COUNT(*) FROM dim_coin) AS total_coins,
+                    (SELECT COUNT(DISTINCT coin_id)
+                     FROM fact_market_data
+                     WHERE timestamp >= NOW() - INTERVAL '15 minutes') AS recent_coins,
+                    (SELECT COUNT(*)
+                     FROM (
+                         SELECT price_usd
+                         FROM fact_market_data
+                         ORDER BY timestamp DESC
+                         LIMIT 100
+                     ) recent
+                     WHERE recent.price_usd IS NULL) AS null_count
                 """
             )
-            null_count = cur.fetchone()[0]
-
-            if null_count == 0:
-                status = "passed"
-                details = "No NULL prices in the last 100 rows"
-            else:
-                status = "failed"
-                details = f"Found {null_count} NULL price_usd values in the last 100 rows"
-
-            logger.info("Null check: %s – %s", status, details)
-            _insert_check(cur, "null_check", "fact_market_data", status, details)
+            max_ts, total_coins, recent_coins, null_count = cur.fetchone()
+
+            results = {
+                "freshness": _freshness_result(max_ts),
+                "completeness": _completeness_result(total_coins, recent_coins),
+                "null_check": _null_result(null_count),
+            }
+            for check_name, (status, details) in results.items():
+                logger.info("%s check: %s – %s", check_name, status, details)
+
+            psycopg2.extras.execute_values(
+                cur,
+                """
+                INSERT INTO data_quality_checks
+                    (check_name, table_name, status, details, executed_at)
+                VALUES %s
+                """,
+                [
+                    (check_name, "fact_market_data", status, details)
+                    for check_name, (status, details) in results.items()
+                ],
+                template="(%s, %s, %s, %s, NOW())",
+            )
         conn.commit()
     finally:
         conn.close()
 
-    context["ti"].xcom_push(key="null_check_status", value=status)
+    ti = context["ti"]
+    ti.xcom_push(key="freshness_status", value=results["freshness"][0])
+    ti.xcom_push(key="completeness_status", value=results["completeness"][0])
+    ti.xcom_push(key="null_check_status", value=results["null_check"][0])
 
 
 def check_anomaly_detection(**context):
     """
     WARNING if any coin shows a > 50 % price change within any 10-minute
-    window in the last hour.  This uses a self-join on fact_market_data to
-    compare each row with the nearest earlier row for the same coin.
+    window in the last hour.  Each row is compared with every earlier row for
+    the same coin in the preceding 10 minutes, via a sliding window frame
+    rather than a self-join.
     """
     conn = _get_conn()
     try:
@@ -184,28 +163,32 @@ def check_anomaly_detection(**context):
             cur.execute(
                 """
                 WITH recent AS (
-                    SELECT coin_id, timestamp, price_usd
+                    SELECT
+                        coin_id,
+                        price_usd,
+                        MIN(price_usd) OVER w AS min_prev,
+                        MAX(price_usd) OVER w AS max_prev
                     FROM fact_market_data
                     WHERE timestamp >= NOW() - INTERVAL '1 hour'
                       AND price_usd IS NOT NULL
                       AND price_usd > 0
+                    -- Rows for the same coin in the 10 minutes before this one
+                    WINDOW w AS (
+                        PARTITION BY coin_id ORDER BY timestamp
+                        RANGE BETWEEN INTERVAL '10 minutes' PRECEDING AND CURRENT ROW
+                        EXCLUDE GROUP
+                    )
                 ),
-                lagged AS (
+                changes AS (
+                    -- |p - q| / q peaks at the lowest or the highest earlier q
                     SELECT
-                        r1.coin_id,
-                        r1.timestamp AS ts1,
-                        r1.price_usd AS price1,
-                        r2.timestamp AS ts2,
-                        r2.price_usd AS price2,
-                        ABS(r1.price_usd - r2.price_usd) / r2.price_usd * 100.0 AS pct_change
-                    FROM recent r1
-                    JOIN recent r2
-                      ON r1.coin_id = r2.coin_id
-                     AND r1.timestamp > r2.timestamp
-                     AND r1.timestamp <= r2.timestamp + INTERVAL '10 minutes'
+                        coin_id,
+                        GREATEST(price_usd / min_prev - 1, 1 - price_usd / max_prev) * 100.0 AS pct_change
+                    FROM recent
+                    WHERE min_prev IS NOT NULL
                 )
                 SELECT coin_id, MAX(pct_change) AS max_pct
-                FROM lagged
+                FROM changes
                 WHERE pct_change > 50
                 GROUP BY coin_id
                 """
@@ -256,19 +239,9 @@ with DAG(
     tags=["cryptoflow", "quality"],
 ) as dag:
 
-    t_freshness = PythonOperator(
-        task_id="check_freshness",
-        python_callable=check_freshness,
-    )
-
-    t_completeness = PythonOperator(
-        task_id="check_completeness",
-        python_callable=check_completeness,
-    )
-
-    t_nulls = PythonOperator(
-        task_id="check_nulls",
-        python_callable=check_nulls,
+    t_snapshot = PythonOperator(
+        task_id="check_snapshot",
+        python_callable=check_snapshot,
     )
 
     t_anomaly = PythonOperator(
@@ -276,5 +249,5 @@ with DAG(
         python_callable=check_anomaly_detection,
     )
 
-    # All four checks can run in parallel – no dependencies between them
-    [t_freshness, t_completeness, t_nulls, t_anomaly]
+    # Both tasks can run in parallel – no dependencies between them
+    [t_snapshot, t_anomaly]
@@ -11,6 +11,7 @@ Chain:  fetch_market_data >> upsert_coins >> insert_market_snapshot
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import os
@@ -24,6 +25,10 @@ import psycopg2.extras
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 
+# API cache invalidation, shared with scripts/jobs
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plugins"))
+from api_cache import LATEST_SNAPSHOT_KEY, PIPELINE_HEALTH_KEY, invalidate_cache  # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Inline CoinGecko helper (DAGs must be self-contained)
 # ---------------------------------------------------------------------------
@@ -42,6 +47,17 @@ logger = logging.getLogger(__name__)
 # CoinGecko request helper
 # ---------------------------------------------------------------------------
 _last_req_time: float = 0.0
+_http: httpx.Client | None = None
+
+
+def _client() -> httpx.Client:
+    """Process-wide client, created on first use rather than at DAG parse, so
+    retries reuse the kept-alive TLS connection."""
+    global _http
+    if _http is None:
+        _http = httpx.Client(timeout=30.0)
+        atexit.register(_http.close)
+    return _http
 
 
 def _cg_get(endpoint: str, params: dict | None = None) -> dict | list:
@@ -56,8 +72,7 @@ def _cg_get(endpoint: str, params: dict | None = None) -> dict | list:
             time.sleep(MIN_REQ_INTERVAL - elapsed)
 
         try:
-            with httpx.Client(timeout=30.0) as client:
-                resp = client.get(url, params=params)
+            resp = _client().get(url, params=params)
             _last_req_time = time.monotonic()
 
             if resp.status_code == 200:
@@ -79,8 +94,7 @@ def _cg_get(endpoint: str, params: dict | None = None) -> dict | list:
     elapsed = time.monotonic() - _last_req_time
     if elapsed < MIN_REQ_INTERVAL:
         time.sleep(MIN_REQ_INTERVAL - elapsed)
-    with httpx.Client(timeout=30.0) as client:
-        resp = client.get(url, params=params)
+    resp = _client().get(url, params=params)
     _last_req_time = time.monotonic()
     resp.raise_for_status()
     return resp.json()
@@ -98,6 +112,14 @@ def _get_conn():
 # Task callables
 # ---------------------------------------------------------------------------
 
+# /coins/markets fields used by upsert_coins and insert_market_snapshot
+_XCOM_FIELDS = (
+    "id", "symbol", "name", "image", "market_cap_rank",
+    "current_price", "market_cap", "total_volume",
+    "price_change_percentage_24h", "circulating_supply",
+)
+
+
 def fetch_market_data(**context):
     """Fetch top-50 coins from CoinGecko /coins/markets and push via XCom."""
     data = _cg_get("/coins/markets", params={
@@ -109,8 +131,11 @@ def fetch_market_data(**context):
         "price_change_percentage": "24h",
     })
     logger.info("Fetched %d coins from CoinGecko", len(data))
-    # Push as JSON string to avoid XCom serialisation quirks
-    context["ti"].xcom_push(key="market_data", value=json.dumps(data))
+    # Only the fields downstream tasks read go into XCom (the full response
+    # carries ~25 more per coin); pushed as a compact JSON string to avoid
+    # XCom serialisation quirks
+    slim = [{k: c[k] for k in _XCOM_FIELDS if k in c} for c in data]
+    context["ti"].xcom_push(key="market_data", value=json.dumps(slim, separators=(",", ":")))
     return len(data)
 
 
@@ -122,8 +147,7 @@ def upsert_coins(**context):
     sql = """
         INSERT INTO dim_coin (coingecko_id, symbol, name, category, description,
                               image_url, market_cap_rank, created_at, updated_at)
-        VALUES (%(coingecko_id)s, %(symbol)s, %(name)s, %(category)s, %(description)s,
-                %(image_url)s, %(market_cap_rank)s, NOW(), NOW())
+        VALUES %s
         ON CONFLICT (coingecko_id) DO UPDATE SET
             symbol          = EXCLUDED.symbol,
             name            = EXCLUDED.name,
@@ -132,9 +156,11 @@ def upsert_coins(**context):
             updated_at      = NOW()
     """
 
-    rows = []
+    # Keyed by coingecko_id: one multi-row upsert cannot update the same row
+    # twice, so a repeated coin keeps only its last entry
+    rows = {}
     for c in coins:
-        rows.append({
+        rows[c["id"]] = {
             "coingecko_id": c["id"],
             "symbol": c.get("symbol", ""),
             "name": c.get("name", ""),
@@ -142,12 +168,17 @@ def upsert_coins(**context):
             "description": None,
             "image_url": c.get("image", ""),
             "market_cap_rank": c.get("market_cap_rank"),
-        })
+        }
 
     conn = _get_conn()
     try:
         with conn.cursor() as cur:
-            psycopg2.extras.execute_batch(cur, sql, rows, page_size=100)
+            psycopg2.extras.execute_values(
+                cur, sql, list(rows.values()),
+                template="(%(coingecko_id)s, %(symbol)s, %(name)s, %(category)s, %(description)s,"
+                         " %(image_url)s, %(market_cap_rank)s, NOW(), NOW())",
+                page_size=1000,
+            )
         conn.commit()
         logger.info("Upserted %d coins into dim_coin", len(rows))
     finally:
@@ -162,57 +193,78 @@ def insert_market_snapshot(**context):
     coins = json.loads(raw)
     now = datetime.now(timezone.utc)
 
+    rows = [
+        (
+            c["id"],
+            now,
+            c.get("current_price"),
+            c.get("market_cap"),
+            c.get("total_volume"),
+            c.get("price_change_percentage_24h"),
+            c.get("circulating_supply"),
+        )
+        for c in coins
+    ]
+
+    # Resolve coingecko_id -> dim_coin.id in the INSERT itself; coins missing
+    # from dim_coin drop out of the join. Casts keep all-NULL columns typed.
+    insert_sql = """
+        INSERT INTO fact_market_data
+            (coin_id, timestamp, price_usd, market_cap, total_volume,
+             price_change_24h_pct, circulating_supply)
+        SELECT d.id, v.ts, v.price, v.mcap, v.vol, v.chg, v.supply
+        FROM (VALUES %s) AS v (cg_id, ts, price, mcap, vol, chg, supply)
+        JOIN dim_coin d ON d.coingecko_id = v.cg_id
+        RETURNING coin_id
+    """
     conn = _get_conn()
     try:
         with conn.cursor() as cur:
-            # Build a lookup: coingecko_id -> dim_coin.id
-            cur.execute("SELECT id, coingecko_id FROM dim_coin")
-            coin_map = {row[1]: row[0] for row in cur.fetchall()}
-
-            rows = []
-            for c in coins:
-                coin_id = coin_map.get(c["id"])
-                if coin_id is None:
-                    logger.warning("Coin %s not found in dim_coin, skipping", c["id"])
-                    continue
-                rows.append((
-                    coin_id,
-                    now,
-                    c.get("current_price"),
-                    c.get("market_cap"),
-                    c.get("total_volume"),
-                    c.get("price_change_percentage_24h"),
-                    c.get("circulating_supply"),
-                ))
-
-            insert_sql = """
-                INSERT INTO fact_market_data
-                    (coin_id, timestamp, price_usd, market_cap, total_volume,
-                     price_change_24h_pct, circulating_supply)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            psycopg2.extras.execute_batch(
-                cur, insert_sql,
-                rows,
-                page_size=100,
-            )
+            inserted = len(psycopg2.extras.execute_values(
+                cur, insert_sql, rows,
+                template="(%s, %s, %s::numeric, %s::numeric, %s::numeric, %s::numeric, %s::numeric)",
+                page_size=1000,
+                fetch=True,
+            ))
         conn.commit()
-        logger.info("Inserted %d rows into fact_market_data", len(rows))
-        context["ti"].xcom_push(key="rows_inserted", value=len(rows))
+        if inserted < len(rows):
+            logger.warning("%d coin(s) not found in dim_coin, skipped", len(rows) - inserted)
+        logger.info("Inserted %d rows into fact_market_data", inserted)
+        context["ti"].xcom_push(key="rows_inserted", value=inserted)
     finally:
         conn.close()
 
-    return len(rows)
+    return inserted
 
 
 def refresh_materialized_view(**context):
-    """Refresh the mv_latest_market_data materialised view."""
+    """
+    Refresh the mv_latest_market_data materialised view.
+
+    Skipped when the snapshot inserted nothing, and when another refresh
+    already holds the view's advisory lock (a second CONCURRENTLY refresh
+    would only queue behind it and redo the same work).
+    """
+    rows_inserted = context["ti"].xcom_pull(task_ids="insert_market_snapshot", key="rows_inserted")
+    if rows_inserted == 0:
+        logger.info("No new market data; skipping mv_latest_market_data refresh")
+        return
+
     conn = _get_conn()
     try:
         conn.autocommit = True
         with conn.cursor() as cur:
-            cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_latest_market_data")
+            cur.execute("SELECT pg_try_advisory_lock(hashtext('mv_latest_market_data'))")
+            if not cur.fetchone()[0]:
+                logger.info("mv_latest_market_data refresh already running; skipping")
+                return
+            try:
+                cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_latest_market_data")
+            finally:
+                cur.execute("SELECT pg_advisory_unlock(hashtext('mv_latest_market_data'))")
         logger.info("Materialized view mv_latest_market_data refreshed")
+        # Drop the API's Redis copy of the view so the next read rebuilds it
+        invalidate_cache(LATEST_SNAPSHOT_KEY)
     finally:
         conn.close()
 
@@ -241,6 +293,8 @@ def log_pipeline_run(**context):
                 ),
             )
         conn.commit()
+        # Let the API's health endpoint show this run right away
+        invalidate_cache(PIPELINE_HEALTH_KEY)
         logger.info("Logged pipeline run: %d records processed", rows_inserted)
     finally:
         conn.close()
@@ -0,0 +1,36 @@
+"""
+Invalidation of the API's Redis response cache from pipeline processes.
+
+The Airflow DAGs and the cron jobs in scripts/jobs both import this module
+(by putting this directory on sys.path), so the key layout lives in one place.
+It mirrors backend/app/utils/cache.py; backend/tests/test_utils/test_cache.py
+checks that the keys deleted here are the ones the API writes.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Prefix app/utils/cache.py puts in front of every response-cache key
+KEY_PREFIX = "cache:"
+
+# Redis hash of mv_latest_market_data (app/services/market_service.py)
+LATEST_SNAPSHOT_KEY = "mv:latest"
+
+# Per-DAG health summary (app/routers/pipeline.py); stale once a run is logged
+PIPELINE_HEALTH_KEY = "pipeline:health"
+
+
+def invalidate_cache(*keys: str) -> None:
+    """Best-effort delete of API cache keys, given without ``KEY_PREFIX``.
+
+    A missing redis package or an unreachable server is logged and ignored;
+    the cached entries then expire on their own TTL.
+    """
+    try:
+        import redis
+        client = redis.Redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+        client.delete(*(KEY_PREFIX + key for key in keys))
+    except Exception as exc:
+        logger.warning("Cache invalidation of %s skipped: %s", ", ".join(keys), exc)
@@ -1,11 +1,17 @@
 """Shared utilities for batch jobs: connection management and pipeline logging."""
 import logging
 import os
+import sys
 from contextlib import contextmanager
 from datetime import datetime, timezone
+from pathlib import Path
 
 import psycopg2
 
+# API cache keys and their invalidation are shared with the Airflow DAGs
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "pipelines" / "plugins"))
+from api_cache import LATEST_SNAPSHOT_KEY, PIPELINE_HEALTH_KEY, invalidate_cache  # noqa: E402,F401
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,9 +48,12 @@ def log_pipeline_run(
             """, (job_id, status, start_time, end_time, records_processed, error_message))
             conn.commit()
             cur.close()
+        # Let the API's health endpoint show this run right away
+        invalidate_cache(PIPELINE_HEALTH_KEY)
     except Exception as e:
         logger.error(f"Failed to log pipeline run: {e}")
 
     duration = (end_time - start_time).total_seconds()
     logger.info(f"Job finished: {status} ({records_processed} records in {duration:.1f}s)")
     return status
+
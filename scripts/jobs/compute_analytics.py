@@ -121,13 +121,14 @@ def run():
                             corr = pearson(returns_a[:min_len], returns_b[:min_len])
 
                         corr_val = round(corr, 6) if corr is not None else None
-                        corr_rows.append((coin_a, coin_b, period_days, corr_val, datetime.now(timezone.utc)))
+                        corr_rows.append((coin_a, coin_b, period_days, corr_val))
                         if coin_a != coin_b:
-                            corr_rows.append((coin_b, coin_a, period_days, corr_val, datetime.now(timezone.utc)))
+                            corr_rows.append((coin_b, coin_a, period_days, corr_val))
 
                 if corr_rows:
+                    # computed_at comes from the column's server default
                     execute_values(cur, """
-                        INSERT INTO analytics_correlation (coin_a_id, coin_b_id, period_days, correlation, computed_at)
+                        INSERT INTO analytics_correlation (coin_a_id, coin_b_id, period_days, correlation)
                         VALUES %s
                         ON CONFLICT (coin_a_id, coin_b_id, period_days) DO UPDATE SET
                             correlation = EXCLUDED.correlation,
@@ -190,12 +191,11 @@ def run():
                         round(vol, 6),
                         round(max_dd, 4),
                         round(max(min(sharpe, 99.0), -99.0), 4),
-                        datetime.now(timezone.utc),
                     ))
 
                 if vol_rows:
                     execute_values(cur, """
-                        INSERT INTO analytics_volatility (coin_id, period_days, volatility, max_drawdown, sharpe_ratio, computed_at)
+                        INSERT INTO analytics_volatility (coin_id, period_days, volatility, max_drawdown, sharpe_ratio)
                         VALUES %s
                         ON CONFLICT (coin_id, period_days) DO UPDATE SET
                             volatility = EXCLUDED.volatility,
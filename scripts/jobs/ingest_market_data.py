@@ -16,7 +16,7 @@ from pathlib import Path
 import httpx
 import psycopg2
 from psycopg2.extras import execute_values
-from _common import db_connection, log_pipeline_run
+from _common import LATEST_SNAPSHOT_KEY, db_connection, invalidate_cache, log_pipeline_run
 
 # Load .env from project root
 from dotenv import load_dotenv
@@ -139,6 +139,8 @@ def run():
             cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_latest_market_data")
             conn.commit()
             logger.info("Materialized view refreshed")
+            # The API's Redis snapshot of the view (market_service) is now stale
+            invalidate_cache(LATEST_SNAPSHOT_KEY)
 
             cur.close()
 
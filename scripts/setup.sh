@@ -54,8 +54,12 @@ cd "$PROJECT_DIR"
 su - postgres -c "psql -d cryptoflow -c \"
 CREATE MATERIALIZED VIEW IF NOT EXISTS mv_latest_market_data AS
 SELECT DISTINCT ON (coin_id)
-    coin_id, timestamp, price_usd, market_cap,
-    total_volume, price_change_24h_pct, circulating_supply
+    coin_id, timestamp,
+    price_usd::double precision AS price_usd,
+    market_cap::double precision AS market_cap,
+    total_volume::double precision AS total_volume,
+    price_change_24h_pct::double precision AS price_change_24h_pct,
+    circulating_supply::double precision AS circulating_supply
 FROM fact_market_data
 ORDER BY coin_id, timestamp DESC;
 \"" 2>/dev/null || true